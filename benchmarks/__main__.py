@@ -0,0 +1,64 @@
+"""
+Offline benchmarks of the music pipeline.
+
+    python -m benchmarks [--quick] [--json results.json]
+
+yt-dlp, FFmpeg and the Discord voice connection are replaced by the fakes in
+``benchmarks.fakes``, so runs need no network and are comparable across changes.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+from . import scenarios
+
+
+async def run(quick: bool) -> dict[str, float]:
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        with scenarios.offline_music(workdir):
+            results |= await scenarios.command_latency(
+                workdir / "latency", runs=5 if quick else 20
+            )
+            results |= await scenarios.track_gaps(
+                workdir / "gaps", tracks=5 if quick else 20
+            )
+            results |= await scenarios.gapless_track_gaps(
+                workdir / "gapless", tracks=5 if quick else 20
+            )
+            results |= await scenarios.playlist_expansion(
+                workdir / "playlist", size=500 if quick else 5000
+            )
+        results |= scenarios.queue_operations(
+            size=100_000, operations=2_000 if quick else 20_000
+        )
+        results |= scenarios.store_operations(
+            workdir, operations=200 if quick else 2_000
+        )
+        results |= await scenarios.cleanup_pass(workdir, files=200 if quick else 2_000)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads")
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    results = asyncio.run(run(args.quick))
+
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:>14,.2f}")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
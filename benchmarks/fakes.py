@@ -0,0 +1,228 @@
+"""Local stand-ins for yt-dlp and Discord voice used by the benchmarks."""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlparse
+
+import discord
+
+FRAME_BYTES = 3840
+
+
+def video_url(index: int) -> str:
+    return f"https://www.youtube.com/watch?v=bench{index:06d}"
+
+
+def playlist_url(size: int) -> str:
+    return f"https://www.youtube.com/playlist?list=PLbench{size}"
+
+
+class FakeYoutubeDL:
+    """
+    Serves synthetic videos and playlists with configurable latency.
+
+    Video URLs carry their id in ``v=``, playlist URLs encode their length in
+    ``list=PLbench<size>``. Downloads write ``file_bytes`` of filler data.
+    """
+
+    extract_seconds = 0.05
+    download_bytes_per_second = 50 * 1024 * 1024
+    file_bytes = 512 * 1024
+    extract_calls = 0
+    download_calls = 0
+
+    def __init__(self, params: dict | None = None):
+        self.params = params or {}
+
+    def __enter__(self) -> "FakeYoutubeDL":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def extract_info(
+        self, url: str, download: bool = True, process: bool = True, **kwargs: Any
+    ) -> dict:
+        type(self).extract_calls += 1
+        time.sleep(self.extract_seconds)
+        query = parse_qs(urlparse(url).query)
+        if "list" in query:
+            return self._playlist(query["list"][0])
+        return self._video(query["v"][0])
+
+    def process_ie_result(self, info: dict, download: bool = True) -> dict:
+        # Format selection: the chosen format's fields end up on the info dict.
+        formats = info.get("formats") or []
+        return {**info, **formats[0]} if formats else info
+
+    def sanitize_info(self, info: dict) -> dict:
+        return dict(info)
+
+    def prepare_filename(self, info: dict) -> str:
+        return self.params["outtmpl"] % info
+
+    def process_info(self, info: dict) -> None:
+        type(self).download_calls += 1
+        path = Path(self.prepare_filename(info))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        chunk = 64 * 1024
+        written = 0
+        with open(path, "wb") as f:
+            while written < self.file_bytes:
+                f.write(b"\0" * chunk)
+                written += chunk
+                time.sleep(chunk / self.download_bytes_per_second)
+                for hook in self.params.get("progress_hooks", []):
+                    hook(
+                        {
+                            "status": "downloading",
+                            "downloaded_bytes": written,
+                            "total_bytes": self.file_bytes,
+                        }
+                    )
+
+    @staticmethod
+    def _video(video_id: str) -> dict:
+        audio = {
+            "format_id": "251",
+            "url": f"https://media.invalid/{video_id}.webm",
+            "ext": "webm",
+            "acodec": "opus",
+            "vcodec": "none",
+            "abr": 160,
+        }
+        return {
+            "id": video_id,
+            "title": f"Benchmark track {video_id}",
+            "duration": 180,
+            "extractor": "youtube",
+            "extractor_key": "Youtube",
+            "webpage_url": f"https://www.youtube.com/watch?v={video_id}",
+            "formats": [audio],
+            **audio,
+        }
+
+    @staticmethod
+    def _playlist(playlist_id: str) -> dict:
+        size = int(playlist_id.removeprefix("PLbench"))
+        return {
+            "_type": "playlist",
+            "id": playlist_id,
+            "title": f"Benchmark playlist of {size}",
+            "extractor_key": "YoutubeTab",
+            "playlist_count": size,
+            "entries": (
+                {"url": video_url(i), "title": f"Benchmark track {i}"}
+                for i in range(size)
+            ),
+        }
+
+
+class FakeAudioSource(discord.AudioSource):
+    """A source of ``frames`` silent 20 ms frames."""
+
+    def __init__(self, frames: int):
+        self.frames = frames
+
+    def read(self) -> bytes:
+        if self.frames <= 0:
+            return b""
+        self.frames -= 1
+        return b"\0" * FRAME_BYTES
+
+    def is_opus(self) -> bool:
+        return False
+
+
+class FakeVoiceClient:
+    """
+    Consumes frames on its own thread like discord's audio player, recording
+    when each track started and finished.
+    """
+
+    frame_seconds = 0.002
+
+    def __init__(self, channel: SimpleNamespace):
+        self.channel = channel
+        self.source: discord.AudioSource | None = None
+        self.starts: list[float] = []
+        self.finishes: list[float] = []
+        self.frame_times: list[float] = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def is_connected(self) -> bool:
+        return True
+
+    def is_playing(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def play(
+        self,
+        source: discord.AudioSource,
+        after: Callable[[Exception | None], Any] | None = None,
+    ) -> None:
+        self.source = source
+        self._stop.clear()
+        self.starts.append(time.perf_counter())
+        self._thread = threading.Thread(
+            target=self._consume, args=(source, after), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def disconnect(self, force: bool = False) -> None:
+        self.stop()
+
+    async def move_to(self, channel: SimpleNamespace) -> None:
+        self.channel = channel
+
+    def gaps(self) -> list[float]:
+        return [start - end for end, start in zip(self.finishes, self.starts[1:])]
+
+    def _consume(
+        self,
+        source: discord.AudioSource,
+        after: Callable[[Exception | None], Any] | None,
+    ) -> None:
+        while not self._stop.is_set() and source.read():
+            self.frame_times.append(time.perf_counter())
+            time.sleep(self.frame_seconds)
+        self.finishes.append(time.perf_counter())
+        source.cleanup()
+        self.source = None
+        if after:
+            after(None)
+
+
+class FakeContext:
+    """Just enough of ``commands.Context`` for the music service."""
+
+    def __init__(self, guild_id: int, loop: asyncio.AbstractEventLoop):
+        channel = SimpleNamespace(
+            id=guild_id, bitrate=96000, name=f"voice-{guild_id}", members=[]
+        )
+        self.voice_client: FakeVoiceClient | None = None
+        self.guild = SimpleNamespace(id=guild_id)
+        self.bot = SimpleNamespace(loop=loop)
+        self.author = SimpleNamespace(
+            voice=SimpleNamespace(
+                channel=SimpleNamespace(connect=self._connect, **vars(channel))
+            )
+        )
+        self._channel = channel
+        self.channel = SimpleNamespace(id=guild_id, name=f"text-{guild_id}")
+        self.messages: list[str] = []
+
+    async def send(self, content: str = "", **kwargs: Any) -> None:
+        self.messages.append(content)
+
+    async def _connect(self) -> FakeVoiceClient:
+        self.voice_client = FakeVoiceClient(self._channel)
+        return self.voice_client
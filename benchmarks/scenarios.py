@@ -0,0 +1,311 @@
+"""Benchmark scenarios; each returns a flat ``{metric: value}`` dict."""
+
+import asyncio
+import os
+import random
+import statistics
+import time
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator
+from unittest.mock import patch
+
+from src.modules.music.service import (
+    extractor_pool,
+    memory_playlist_handler,
+    music_service,
+)
+from src.modules.music.service.audio_cache import AudioCache
+from src.modules.music.service.memory_playlist_handler import MemoryPlaylistHandler
+from src.modules.music.service.metadata_cache import MetadataCache
+from src.modules.music.service.music_service import MusicService
+from src.modules.music.service.playlist_store import SqlitePlaylistStore
+from src.modules.music.service.track_queue import TrackQueue
+from src.modules.music.service.yt_playlist_handler import Queue
+from src.modules.music.settings import MusicSettings
+from src.modules.utils import CleanupService
+
+from .fakes import (
+    FakeAudioSource,
+    FakeContext,
+    FakeYoutubeDL,
+    playlist_url,
+    video_url,
+)
+
+TRACK_FRAMES = 50
+
+
+def summarize(name: str, samples: list[float], unit: str = "ms") -> dict[str, float]:
+    scale = 1000 if unit == "ms" else 1
+    ordered = sorted(samples)
+    p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+    return {
+        f"{name}_median_{unit}": statistics.median(ordered) * scale,
+        f"{name}_p95_{unit}": p95 * scale,
+        f"{name}_max_{unit}": ordered[-1] * scale,
+    }
+
+
+def rate(name: str, count: int, fn: Callable[[], object]) -> dict[str, float]:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return {f"{name}_ops_per_s": count / (time.perf_counter() - start)}
+
+
+@contextmanager
+def offline_music(workdir: Path) -> Iterator[None]:
+    """Route yt-dlp, FFmpeg and every on-disk store of the music module to fakes and ``workdir``."""
+
+    def memory_handler(**kwargs: object) -> MemoryPlaylistHandler:
+        store = SqlitePlaylistStore(
+            db_file=workdir / "playlists.sqlite3",
+            legacy_file=workdir / "playlists.json",
+        )
+        return MemoryPlaylistHandler(store=store, **kwargs)  # type: ignore[arg-type]
+
+    with ExitStack() as stack:
+        for target, name, value in (
+            (extractor_pool, "YoutubeDL", FakeYoutubeDL),
+            (music_service, "YoutubeDL", FakeYoutubeDL),
+            (
+                music_service,
+                "build_audio_source",
+                lambda *args, **kwargs: FakeAudioSource(TRACK_FRAMES),
+            ),
+            (
+                music_service,
+                "MetadataCache",
+                partial(MetadataCache, db_file=workdir / "metadata.sqlite3"),
+            ),
+            (music_service, "MemoryPlaylistHandler", memory_handler),
+            (
+                memory_playlist_handler,
+                "PLAYLIST_LOG_FILE",
+                workdir / "playlists_changes.jsonl",
+            ),
+        ):
+            stack.enter_context(patch.object(target, name, value))
+        yield
+
+
+def new_service(workdir: Path, **settings: object) -> MusicService:
+    return MusicService(
+        audio_cache=AudioCache(cache_dir=workdir / "downloads"),
+        settings=MusicSettings(**settings),  # type: ignore[arg-type]
+    )
+
+
+async def wait_for_starts(ctx: FakeContext, count: int, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if ctx.voice_client and len(ctx.voice_client.starts) >= count:
+            return
+        await asyncio.sleep(0.001)
+    raise TimeoutError(f"Playback did not reach {count} tracks")
+
+
+async def command_latency(workdir: Path, runs: int) -> dict[str, float]:
+    """Time from ``!p <url>`` on an idle guild until the voice client gets audio."""
+    service = new_service(workdir)
+    loop = asyncio.get_running_loop()
+    results: dict[str, float] = {}
+    for phase in ("cold", "warm"):
+        samples = []
+        for index in range(runs):
+            ctx = FakeContext(guild_id=hash((phase, index)), loop=loop)
+            start = time.perf_counter()
+            await service.play(ctx, video_url(index))  # type: ignore[arg-type]
+            await wait_for_starts(ctx, 1)
+            assert ctx.voice_client is not None
+            samples.append(ctx.voice_client.starts[0] - start)
+            await service.release_player(ctx.guild.id)
+        results |= summarize(f"command_latency_{phase}", samples)
+    return results
+
+
+async def track_gaps(workdir: Path, tracks: int) -> dict[str, float]:
+    """Silence between consecutive tracks of a memory playlist."""
+    service = new_service(workdir)
+    handler = service._memory_playlist_handler
+    store = handler._store
+    playlist_id = store.create_playlist("benchmark")
+    for index in range(1000, 1000 + tracks):
+        store.add_track(playlist_id, video_url(index), f"Benchmark track {index}")
+
+    ctx = FakeContext(guild_id=1, loop=asyncio.get_running_loop())
+    start = time.perf_counter()
+    await service.play_from_memory_playlist(ctx, playlist_id + 1)  # type: ignore[arg-type]
+    enqueue_seconds = time.perf_counter() - start
+    await wait_for_starts(ctx, tracks)
+    assert ctx.voice_client is not None
+    gaps = ctx.voice_client.gaps()
+    await service.release_player(ctx.guild.id)
+    return {
+        "memory_playlist_enqueue_ms": enqueue_seconds * 1000,
+        **summarize("track_gap", gaps),
+    }
+
+
+async def gapless_track_gaps(workdir: Path, tracks: int) -> dict[str, float]:
+    """
+    Delay added at each track boundary with gapless playback, beyond the
+    regular frame interval; one source plays the whole chain of tracks.
+    """
+    service = new_service(workdir, GAPLESS=True)
+    ctx = FakeContext(guild_id=3, loop=asyncio.get_running_loop())
+    player = service.get_player(ctx.guild.id)
+    await service._ensure_voice_client(ctx, player)  # type: ignore[arg-type]
+    await service.enqueue_tracks(
+        ctx,  # type: ignore[arg-type]
+        player,
+        [Queue(url=video_url(2000 + i), title=f"Track {i}") for i in range(tracks)],
+    )
+    assert ctx.voice_client is not None
+    frames = ctx.voice_client.frame_times
+    deadline = time.perf_counter() + 60
+    while len(frames) < tracks * TRACK_FRAMES:
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Gapless playback did not finish")
+        await asyncio.sleep(0.005)
+    await service.release_player(ctx.guild.id)
+
+    period = ctx.voice_client.frame_seconds
+    gaps = [
+        frames[boundary] - frames[boundary - 1] - period
+        for boundary in range(TRACK_FRAMES, tracks * TRACK_FRAMES, TRACK_FRAMES)
+    ]
+    return summarize("gapless_track_gap", gaps)
+
+
+async def playlist_expansion(workdir: Path, size: int) -> dict[str, float]:
+    """Lazy expansion of a large YouTube playlist."""
+    service = new_service(workdir)
+    handler = service._yt_playlist_handler
+    page_size = service._settings.PLAYLIST_PAGE_SIZE
+
+    start = time.perf_counter()
+    cursor = await handler.open_playlist(playlist_url(size))
+    open_seconds = time.perf_counter() - start
+    pages = []
+    while not cursor.exhausted:
+        page_start = time.perf_counter()
+        await handler.next_page(cursor, page_size)
+        pages.append(time.perf_counter() - page_start)
+
+    ctx = FakeContext(guild_id=2, loop=asyncio.get_running_loop())
+    start = time.perf_counter()
+    await service.play(ctx, playlist_url(size))  # type: ignore[arg-type]
+    await wait_for_starts(ctx, 1)
+    assert ctx.voice_client is not None
+    first_audio = ctx.voice_client.starts[0] - start
+    await service.release_player(ctx.guild.id)
+    return {
+        "playlist_open_ms": open_seconds * 1000,
+        **summarize("playlist_page", pages),
+        "playlist_first_audio_ms": first_audio * 1000,
+    }
+
+
+def queue_operations(size: int, operations: int) -> dict[str, float]:
+    """Throughput of TrackQueue operations on a queue of ``size`` tracks."""
+    tracks = [Queue(url=video_url(i), title=f"Track {i}") for i in range(size)]
+    queue = TrackQueue()
+    results = rate("queue_append", size, partial(queue.append, tracks[0]))
+    queue = TrackQueue()
+    queue.extend(tracks)
+
+    def positions() -> int:
+        return random.randrange(len(queue))
+
+    results |= rate("queue_index", operations, lambda: queue[positions()])
+
+    def page() -> list[Queue]:
+        start = positions()
+        return queue[start : start + 20]
+
+    results |= rate("queue_page", operations, page)
+    results |= rate(
+        "queue_insert", operations, lambda: queue.insert(positions(), tracks[0])
+    )
+    results |= rate("queue_remove_at", operations, lambda: queue.remove_at(positions()))
+    results |= rate(
+        "queue_move", operations, lambda: queue.move(positions(), positions())
+    )
+    results |= rate("queue_shuffle", 10, queue.shuffle)
+    results |= rate("queue_popleft", operations, queue.popleft)
+    return results
+
+
+def store_operations(workdir: Path, operations: int) -> dict[str, float]:
+    """Playlist store throughput against a fresh SQLite database."""
+    store = SqlitePlaylistStore(
+        db_file=workdir / "store.sqlite3", legacy_file=workdir / "none.json"
+    )
+    playlist_id = store.create_playlist("benchmark")
+    counter = iter(range(10**9))
+    results = rate(
+        "store_add_track",
+        operations,
+        lambda: store.add_track(playlist_id, video_url(next(counter)), "Track"),
+    )
+    results |= rate(
+        "store_create_playlist", operations // 10, lambda: store.create_playlist("p")
+    )
+    results |= rate(
+        "store_get_playlist_page",
+        operations,
+        lambda: store.get_playlist_page(playlist_id, random.randrange(operations), 10),
+    )
+    results |= rate(
+        "store_list_playlists", operations // 10, lambda: store.list_playlists(15, 0, 3)
+    )
+    results |= rate(
+        "store_remove_track",
+        operations // 2,
+        lambda: store.remove_track(playlist_id, 0),
+    )
+    return results
+
+
+async def cleanup_pass(workdir: Path, files: int) -> dict[str, float]:
+    """Audio cache writes under a byte budget, then one CleanupService pass."""
+    cache_dir = workdir / "cleanup"
+    cache_dir.mkdir()
+    audio_cache = AudioCache(cache_dir=cache_dir, max_total_size_mb=1)
+    old = time.time() - 7200
+    paths = []
+    for index in range(files):
+        path = cache_dir / f"Youtube-bench{index:06d}.webm"
+        path.write_bytes(b"\0" * 4096)
+        os.utime(path, (old, old))
+        paths.append(path)
+
+    start = time.perf_counter()
+    for index, path in enumerate(paths):
+        if index % 2:
+            audio_cache.put(path.stem, path)
+    put_seconds = time.perf_counter() - start
+
+    service = CleanupService(audio_cache=audio_cache)
+    loop_lag = []
+
+    async def tick() -> None:
+        while True:
+            due = time.perf_counter() + 0.001
+            await asyncio.sleep(0.001)
+            loop_lag.append(time.perf_counter() - due)
+
+    ticker = asyncio.create_task(tick())
+    start = time.perf_counter()
+    await service._reconcile()
+    await service._enforce_size_limit()
+    pass_seconds = time.perf_counter() - start
+    ticker.cancel()
+    return {
+        "cache_put_with_budget_ops_per_s": (files // 2) / put_seconds,
+        "cleanup_pass_ms": pass_seconds * 1000,
+        "cleanup_max_loop_lag_ms": max(loop_lag, default=0.0) * 1000,
+    }
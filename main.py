@@ -1,15 +1,14 @@
 import asyncio
-from logging.config import dictConfig
 
 from discord import Intents
 
 from config import DISCORD_BOT_TOKEN
 from src.bot import DiscordBot
-from src.modules.utils import LOGGING_CONFIG
+from src.modules.utils import setup_logging
 
 
 async def main():
-    dictConfig(LOGGING_CONFIG)
+    setup_logging()
     intents = Intents.all()
     discord_bot = DiscordBot(command_prefix="!", intents=intents)
     await discord_bot._setup_cogs()
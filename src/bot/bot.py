@@ -2,7 +2,13 @@ from attrs import define, field
 from discord import Intents
 from discord.ext.commands import Bot
 
-from src.modules.music import MusicCog, MusicService
+from src.modules.metrics import (
+    LoopMonitor,
+    MetricsServer,
+    MetricsSettings,
+    SamplingProfiler,
+)
+from src.modules.music import AudioCache, MusicCog, MusicService
 from src.modules.utils import CleanupService, UtilsCog, UtilsService
 
 
@@ -10,18 +16,40 @@ from src.modules.utils import CleanupService, UtilsCog, UtilsService
 class DiscordBot(Bot):
     command_prefix: str
     intents: Intents
+    audio_cache: AudioCache = field(init=False)
     music_service: MusicService = field(init=False)
     utils_service: UtilsService = field(init=False)
     cleanup_service: CleanupService = field(init=False)
+    metrics_server: MetricsServer | None = field(init=False, default=None)
+    loop_monitor: LoopMonitor | None = field(init=False, default=None)
 
     def __attrs_post_init__(self) -> None:
         super().__init__(command_prefix=self.command_prefix, intents=self.intents)
         self._setup_services()
 
     def _setup_services(self) -> None:
-        self.music_service = MusicService()
+        self.audio_cache = AudioCache()
+        self.music_service = MusicService(audio_cache=self.audio_cache)
         self.utils_service = UtilsService()
-        self.cleanup_service = CleanupService()
+        self.cleanup_service = CleanupService(
+            audio_cache=self.audio_cache,
+            metadata_cache=self.music_service.metadata_cache,
+        )
+        metrics_settings = MetricsSettings()
+        if metrics_settings.LOOP_MONITOR_ENABLED:
+            self.loop_monitor = LoopMonitor(
+                interval_seconds=metrics_settings.LOOP_LAG_INTERVAL_SECONDS,
+                slow_callback_seconds=metrics_settings.SLOW_CALLBACK_SECONDS,
+            )
+        if metrics_settings.ENABLED:
+            self.metrics_server = MetricsServer(
+                host=metrics_settings.HOST,
+                port=metrics_settings.PORT,
+                loop_monitor=self.loop_monitor,
+                profiler=(
+                    SamplingProfiler() if metrics_settings.PROFILER_ENABLED else None
+                ),
+            )
 
     async def _setup_cogs(self) -> None:
         await self.add_cog(MusicCog(bot=self, music_service=self.music_service))
@@ -31,6 +59,10 @@ class DiscordBot(Bot):
         if self.user:
             await self.utils_service.on_ready(user=self.user)
         self.loop.create_task(self.cleanup_service.run())
+        if self.loop_monitor:
+            self.loop_monitor.start()
+        if self.metrics_server:
+            await self.metrics_server.start()
 
-    async def clear_music_queue(self) -> None:
-        await self.music_service.clear_queue()
+    async def clear_music_queue(self, guild_id: int) -> None:
+        await self.music_service.release_player(guild_id)
@@ -0,0 +1,6 @@
+from .service.loop_monitor import LoopMonitor as LoopMonitor
+from .service.loop_monitor import SamplingProfiler as SamplingProfiler
+from .service.metrics_server import MetricsServer as MetricsServer
+from .service.registry import REGISTRY as REGISTRY
+from .service.registry import MetricsRegistry as MetricsRegistry
+from .settings import MetricsSettings as MetricsSettings
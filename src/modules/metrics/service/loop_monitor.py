@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from types import FrameType
+
+from attrs import define, field
+
+from .registry import REGISTRY
+
+LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "event_loop_lag_seconds",
+    "Delay between when a loop wake-up was due and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+SLOW_CALLBACKS = REGISTRY.counter(
+    "event_loop_slow_callbacks_total",
+    "Times the event loop was blocked longer than the slow callback threshold",
+)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", code.co_filename)
+    return f"{module}:{code.co_name}"
+
+
+def _folded_stack(frame: FrameType | None) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+@define
+class SlowCallback:
+    started_at: float
+    duration: float
+    stack: str
+
+
+@define
+class LoopMonitor:
+    """
+    Watches the event loop for scheduling lag and for callbacks that block it.
+
+    A task on the loop wakes up every ``interval_seconds`` and records how late
+    it ran. A watchdog thread notices when that heartbeat stalls for longer than
+    ``slow_callback_seconds`` and captures the loop thread's stack while it is
+    still blocked, so the culprit shows up in the log and in ``slow_callbacks``.
+    """
+
+    interval_seconds: float = 0.5
+    slow_callback_seconds: float = 0.25
+    history: int = 50
+    slow_callbacks: deque[SlowCallback] = field(init=False)
+    _heartbeat: float = field(init=False, factory=time.monotonic)
+    _loop_thread_id: int | None = field(init=False, default=None)
+    _task: asyncio.Task | None = field(init=False, default=None)
+    _stopped: threading.Event = field(init=False, factory=threading.Event)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.slow_callbacks = deque(maxlen=self.history)
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._measure_lag())
+        threading.Thread(
+            target=self._watchdog, name="loop-watchdog", daemon=True
+        ).start()
+        self.logger.info(
+            f"Loop monitor started — slow callback threshold "
+            f"{self.slow_callback_seconds * 1000:.0f} ms"
+        )
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _measure_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            LOOP_LAG_SECONDS.observe(max(loop.time() - due, 0.0))
+            self._heartbeat = time.monotonic()
+
+    def _watchdog(self) -> None:
+        check_every = self.slow_callback_seconds / 2
+        stalled_since = None
+        stack = ""
+        while not self._stopped.wait(check_every):
+            heartbeat = self._heartbeat
+            overdue = time.monotonic() - heartbeat - self.interval_seconds
+            if stalled_since is not None and stalled_since != heartbeat:
+                duration = heartbeat - stalled_since - self.interval_seconds
+                self._record(stalled_since, duration, stack)
+                stalled_since = None
+
+            if overdue > self.slow_callback_seconds and stalled_since is None:
+                stalled_since = heartbeat
+                stack = self._loop_stack()
+
+    def _loop_stack(self) -> str:
+        if self._loop_thread_id is None:
+            return ""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        return "".join(traceback.format_stack(frame)) if frame else ""
+
+    def _record(self, started_at: float, duration: float, stack: str) -> None:
+        SLOW_CALLBACKS.inc()
+        self.slow_callbacks.append(
+            SlowCallback(started_at=started_at, duration=duration, stack=stack)
+        )
+        self.logger.warning(
+            f"Event loop blocked for {duration * 1000:.0f} ms, stack:\n{stack}"
+        )
+
+
+@define
+class SamplingProfiler:
+    """
+    Samples thread stacks from a background thread and aggregates them into
+    folded stacks (``frame;frame;frame count``), the input format of flame
+    graph tools such as ``flamegraph.pl`` and speedscope.
+    """
+
+    sample_interval_seconds: float = 0.005
+    _lock: threading.Lock = field(init=False, factory=threading.Lock)
+
+    def profile(self, seconds: float, thread_id: int | None = None) -> dict[str, int]:
+        """Sample for ``seconds``; only ``thread_id`` if given, else every thread."""
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        samples: Counter[str] = Counter()
+        with self._lock:
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_id or (thread_id and ident != thread_id):
+                        continue
+                    thread = names.get(ident, str(ident))
+                    samples[f"{thread};{_folded_stack(frame)}"] += 1
+                time.sleep(self.sample_interval_seconds)
+        return dict(samples)
+
+    @staticmethod
+    def folded(samples: dict[str, int]) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in samples.items())
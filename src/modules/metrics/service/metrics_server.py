@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import threading
+
+from aiohttp import web
+from attrs import define, field
+
+from .loop_monitor import LoopMonitor, SamplingProfiler
+from .registry import REGISTRY, MetricsRegistry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+MAX_PROFILE_SECONDS = 60
+
+
+@define
+class MetricsServer:
+    """
+    A small HTTP server in the bot's event loop that serves ``/metrics``.
+
+    Scrapes only read in-memory counters, so they never block the loop for long.
+    With a loop monitor, ``/debug/slow`` lists recent loop stalls with stacks;
+    with a profiler, ``/debug/profile?seconds=10&thread=loop`` samples stacks
+    and returns them folded for flame graph tools.
+    """
+
+    host: str = "0.0.0.0"
+    port: int = 9100
+    registry: MetricsRegistry = REGISTRY
+    loop_monitor: LoopMonitor | None = None
+    profiler: SamplingProfiler | None = None
+    app: web.Application = field(init=False, factory=web.Application)
+    _runner: web.AppRunner | None = field(init=False, default=None)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.app.router.add_get("/metrics", self._metrics)
+        if self.loop_monitor:
+            self.app.router.add_get("/debug/slow", self._slow_callbacks)
+        if self.profiler:
+            self.app.router.add_get("/debug/profile", self._profile)
+
+    @property
+    def is_running(self) -> bool:
+        return self._runner is not None
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+        runner = web.AppRunner(self.app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, self.host, self.port).start()
+        self._runner = runner
+        self.logger.info(f"Metrics available on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render().encode(), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+    async def _slow_callbacks(self, request: web.Request) -> web.Response:
+        assert self.loop_monitor is not None
+        reports = [
+            f"blocked {slow.duration * 1000:.0f} ms\n{slow.stack}"
+            for slow in reversed(self.loop_monitor.slow_callbacks)
+        ]
+        return web.Response(text="\n".join(reports) or "No slow callbacks recorded\n")
+
+    async def _profile(self, request: web.Request) -> web.Response:
+        assert self.profiler is not None
+        try:
+            seconds = float(request.query.get("seconds", "10"))
+        except ValueError:
+            raise web.HTTPBadRequest(text="seconds must be a number")
+        seconds = min(max(seconds, 0.1), MAX_PROFILE_SECONDS)
+        thread_id = (
+            None if request.query.get("thread") == "all" else threading.get_ident()
+        )
+
+        self.logger.info(f"Profiling for {seconds:.1f}s")
+        samples = await asyncio.to_thread(self.profiler.profile, seconds, thread_id)
+        return web.Response(text=self.profiler.folded(samples))
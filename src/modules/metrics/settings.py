@@ -0,0 +1,13 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class MetricsSettings(BaseSettings):
+    ENABLED: bool = False
+    HOST: str = "0.0.0.0"
+    PORT: int = 9100
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+    SLOW_CALLBACK_SECONDS: float = 0.25
+    PROFILER_ENABLED: bool = False
+
+    model_config = SettingsConfigDict(env_prefix="METRICS_CONFIG_", case_sensitive=True)
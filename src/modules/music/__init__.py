@@ -1,2 +1,4 @@
 from .cog.music_cog import MusicCog as MusicCog
+from .service.audio_cache import AudioCache as AudioCache
+from .service.metadata_cache import MetadataCache as MetadataCache
 from .service.music_service import MusicService as MusicService
@@ -0,0 +1,237 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from attrs import asdict, define, field
+
+from .audio_source import AudioFormat
+from .music_metrics import CACHE_EVICTIONS, CACHE_REQUESTS
+
+INDEX_FILE_NAME = "index.json"
+
+
+@define
+class CacheEntry:
+    key: str
+    file_name: str
+    size: int
+    acodec: str | None = None
+    abr: float | None = None
+    last_access: float = field(factory=time.time)
+    hits: int = 0
+
+
+@define
+class AudioCache:
+    """
+    Downloaded audio files keyed by ``<extractor>-<video id>``, evicted least recently used first.
+
+    The total size is tracked incrementally, so the byte budget is enforced right
+    after every download; ``reconcile`` compares the index with the directory and
+    is only needed occasionally.
+    """
+
+    cache_dir: Path = Path("downloads/")
+    max_total_size_mb: int = 400
+    _entries: OrderedDict[str, CacheEntry] = field(init=False, factory=OrderedDict)
+    _pinned: set[str] = field(init=False, factory=set)
+    _total_bytes: int = field(init=False, default=0)
+    _lock: threading.RLock = field(init=False, factory=threading.RLock)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._load_index()
+
+    @property
+    def index_file(self) -> Path:
+        return self.cache_dir / INDEX_FILE_NAME
+
+    @staticmethod
+    def key_for(info: dict) -> str:
+        return f"{info.get('extractor_key', 'generic')}-{info['id']}"
+
+    def get(self, key: str, counted: bool = True) -> Path | None:
+        """
+        The cached file of ``key``, if any; ``counted=False`` keeps a repeated
+        lookup for the same request out of the hit and miss counts.
+        """
+        with self._lock:
+            path = self._lookup(key)
+            if counted:
+                result = "miss" if path is None else "hit"
+                CACHE_REQUESTS.inc(cache="audio", result=result)
+            return path
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def size_of(self, key: str) -> int | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.size if entry else None
+
+    def put(
+        self, key: str, path: Path, audio_format: AudioFormat | None = None
+    ) -> None:
+        """Register a downloaded file and evict older ones if the budget is exceeded."""
+        audio_format = audio_format or AudioFormat()
+        with self._lock:
+            self._forget(key)
+            entry = CacheEntry(
+                key=key,
+                file_name=path.name,
+                size=path.stat().st_size,
+                acodec=audio_format.codec,
+                abr=audio_format.bitrate,
+            )
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+            if not self._evict(keep=key):
+                self.save_index()
+
+    def format_for(self, key: str) -> AudioFormat | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.acodec is None:
+                return None
+            return AudioFormat(codec=entry.acodec, bitrate=entry.abr)
+
+    def file_names(self) -> set[str]:
+        with self._lock:
+            return {e.file_name for e in self._entries.values()} | {INDEX_FILE_NAME}
+
+    def pin(self, path: str | Path) -> None:
+        with self._lock:
+            self._pinned.add(Path(path).name)
+
+    def unpin(self, path: str | Path) -> None:
+        with self._lock:
+            self._pinned.discard(Path(path).name)
+
+    def total_size(self) -> int:
+        return self._total_bytes
+
+    def evict(self) -> list[str]:
+        """Remove least recently used files until the cache fits in its byte budget."""
+        return self._evict()
+
+    def reconcile(self, untracked_grace_seconds: float) -> list[str]:
+        """
+        Bring the index in line with the cache directory.
+
+        Files the index does not know about are deleted once they are older than
+        the grace period (which protects downloads still in progress), entries
+        whose file disappeared are dropped and sizes are re-read. This scans the
+        whole directory, so it should run off the event loop.
+        """
+        if not self.cache_dir.exists():
+            return []
+
+        on_disk = {}
+        for file in self.cache_dir.iterdir():
+            try:
+                if file.is_file():
+                    on_disk[file.name] = file.stat()
+            except FileNotFoundError:
+                continue
+
+        threshold = time.time() - untracked_grace_seconds
+        deleted = []
+        with self._lock:
+            known_files = self.file_names()
+            for name, stat in on_disk.items():
+                if name in known_files or stat.st_mtime >= threshold:
+                    continue
+                try:
+                    (self.cache_dir / name).unlink()
+                    deleted.append(name)
+                except Exception as e:
+                    self.logger.warning(f"Could not delete {name}: {e}")
+
+            for key, entry in list(self._entries.items()):
+                if entry.file_name in on_disk:
+                    entry.size = on_disk[entry.file_name].st_size
+                else:
+                    self._forget(key)
+            self._total_bytes = sum(e.size for e in self._entries.values())
+            self._evict()
+            self.save_index()
+
+        if deleted:
+            CACHE_EVICTIONS.inc(len(deleted), reason="untracked")
+        return deleted
+
+    def _lookup(self, key: str) -> Path | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        path = self.cache_dir / entry.file_name
+        if not path.exists():
+            self._forget(key)
+            return None
+
+        entry.hits += 1
+        entry.last_access = time.time()
+        self._entries.move_to_end(key)
+        return path
+
+    def _evict(self, keep: str | None = None) -> list[str]:
+        budget = self.max_total_size_mb * 1024 * 1024
+        evicted = []
+        with self._lock:
+            for key in list(self._entries):
+                if self._total_bytes <= budget:
+                    break
+                entry = self._entries[key]
+                if key == keep or entry.file_name in self._pinned:
+                    continue
+                try:
+                    (self.cache_dir / entry.file_name).unlink(missing_ok=True)
+                except Exception as e:
+                    self.logger.warning(f"Could not delete {entry.file_name}: {e}")
+                    continue
+                self._forget(key)
+                evicted.append(entry.file_name)
+
+            if evicted:
+                self.save_index()
+                CACHE_EVICTIONS.inc(len(evicted), reason="size")
+                self.logger.info(
+                    f"Evicted {len(evicted)} files, "
+                    f"cache now {self._total_bytes / (1024 * 1024):.2f} MB"
+                )
+        return evicted
+
+    def _forget(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+
+    def save_index(self) -> None:
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entries = [asdict(e) for e in self._entries.values()]
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            tmp_file.replace(self.index_file)
+
+    def _load_index(self) -> None:
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                entries = [CacheEntry(**e) for e in json.load(f)]
+        except Exception as e:
+            self.logger.warning(f"Could not load audio cache index: {e}")
+            return
+
+        for entry in sorted(entries, key=lambda e: e.last_access):
+            self._entries[entry.key] = entry
+            self._total_bytes += entry.size
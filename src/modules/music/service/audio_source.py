@@ -0,0 +1,212 @@
+import logging
+import threading
+from array import array
+from collections import deque
+from typing import Callable
+
+import discord
+from attrs import define, field
+
+DEFAULT_OPUS_BITRATE_KBPS = 128
+FRAME_MILLISECONDS = discord.opus.Encoder.FRAME_LENGTH
+logger = logging.getLogger(__name__)
+
+
+@define
+class AudioFormat:
+    codec: str | None = None
+    bitrate: float | None = None
+
+    @classmethod
+    def from_info(cls, info: dict) -> "AudioFormat":
+        return cls(codec=info.get("acodec"), bitrate=info.get("abr"))
+
+    @property
+    def is_opus(self) -> bool:
+        return self.codec in ("opus", "libopus")
+
+
+async def probe_format(source: str) -> AudioFormat:
+    try:
+        codec, bitrate = await discord.FFmpegOpusAudio.probe(source)
+    except Exception as e:
+        logger.warning(f"Could not probe {source}: {e}")
+        return AudioFormat()
+    return AudioFormat(codec=codec, bitrate=bitrate)
+
+
+def build_audio_source(
+    source: str,
+    audio_format: AudioFormat,
+    before_options: str,
+    max_bitrate_kbps: int | None = None,
+    passthrough: bool = True,
+) -> discord.AudioSource:
+    """
+    Create the FFmpeg source for a track.
+
+    Opus input at a bitrate the channel can carry is remuxed with ``-c:a copy``;
+    anything else is transcoded to Opus by FFmpeg. Only when passthrough is
+    disabled does the track go through PCM and discord.py's own Opus encoder.
+    """
+    if not passthrough:
+        return discord.FFmpegPCMAudio(
+            source, before_options=before_options, options="-vn"
+        )
+
+    bitrate = int(audio_format.bitrate or DEFAULT_OPUS_BITRATE_KBPS)
+    if max_bitrate_kbps:
+        bitrate = min(bitrate, max_bitrate_kbps)
+
+    fits_channel = max_bitrate_kbps is None or (
+        audio_format.bitrate is not None and audio_format.bitrate <= max_bitrate_kbps
+    )
+    codec = "copy" if audio_format.is_opus and fits_channel else None
+    logger.debug(f"Opening {source} with codec={codec or 'libopus'} {bitrate}k")
+    return discord.FFmpegOpusAudio(
+        source,
+        bitrate=bitrate,
+        codec=codec,
+        before_options=before_options,
+        options="-vn",
+    )
+
+
+def _noop(*args: object) -> None:
+    pass
+
+
+@define(eq=False)
+class ChainedTrack:
+    """One track of a GaplessSource, with frames read ahead of playback."""
+
+    source: discord.AudioSource
+    on_start: Callable[[], None] = _noop
+    on_end: Callable[[Exception | None], None] = _noop
+    started: bool = False
+    ended: bool = False
+    eof: bool = False
+    tail_frames: int = 0
+    _frames: deque[bytes] = field(factory=deque)
+
+    def prime(self, frames: int = 1) -> None:
+        """Read up to ``frames`` frames ahead; blocking, so call it off the event loop."""
+        while not self.eof and len(self._frames) < frames:
+            data = self.source.read()
+            if data:
+                self._frames.append(data)
+            else:
+                self.eof = True
+                self.tail_frames = len(self._frames)
+
+    def read(self) -> bytes:
+        if self._frames:
+            return self._frames.popleft()
+        return b"" if self.eof else self.source.read()
+
+    @property
+    def buffered(self) -> int:
+        return len(self._frames)
+
+
+class GaplessSource(discord.AudioSource):
+    """
+    A single source for the voice client that plays a chain of tracks.
+
+    The next track is opened and primed while the current one plays; ``read``
+    switches to it on the frame the current track runs out, so no thread hop
+    or FFmpeg start-up happens between tracks. With ``crossfade_frames`` the
+    last frames of a track are mixed with the first of the next one, which
+    needs PCM sources. Once the chain runs dry the source ends, and appending
+    to it fails; the caller then starts a new one.
+    """
+
+    def __init__(self, opus: bool, crossfade_frames: int = 0):
+        if opus and crossfade_frames:
+            raise ValueError("Crossfading needs PCM sources")
+        self.opus = opus
+        self.crossfade_frames = crossfade_frames
+        self._tracks: deque[ChainedTrack] = deque()
+        self._closed = False
+        self._skip_requested = False
+        self._lock = threading.Lock()
+
+    def append(self, track: ChainedTrack) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            self._tracks.append(track)
+            return True
+
+    def sources(self) -> list[discord.AudioSource]:
+        """The sources of the tracks still in the chain, playing one first."""
+        with self._lock:
+            return [track.source for track in self._tracks]
+
+    def skip(self) -> None:
+        """Drop the current track; the next one, if ready, plays from the next frame."""
+        # Handled by the audio thread, which also kills the skipped FFmpeg process.
+        self._skip_requested = True
+
+    def is_opus(self) -> bool:
+        return self.opus
+
+    def read(self) -> bytes:
+        with self._lock:
+            if self._skip_requested and self._tracks:
+                self._end(self._tracks.popleft())
+            self._skip_requested = False
+            while self._tracks:
+                current = self._tracks[0]
+                if not current.started:
+                    current.started = True
+                    current.on_start()
+                frame = self._next_frame(current)
+                if frame:
+                    return frame
+                self._end(self._tracks.popleft())
+            self._closed = True
+            return b""
+
+    def cleanup(self) -> None:
+        with self._lock:
+            self._closed = True
+            while self._tracks:
+                self._end(self._tracks.popleft())
+
+    def _next_frame(self, current: ChainedTrack) -> bytes:
+        if not self.crossfade_frames:
+            return current.read()
+
+        current.prime(self.crossfade_frames + 1)
+        upcoming = self._tracks[1] if len(self._tracks) > 1 else None
+        if not current.eof or upcoming is None or not current.buffered:
+            return current.read()
+
+        # The current track is in its last frames: fade it into the next one.
+        if not upcoming.started:
+            upcoming.started = True
+            upcoming.on_start()
+        step = current.tail_frames - current.buffered + 1
+        fade_in = step / (current.tail_frames + 1)
+        return _mix(current.read(), upcoming.read(), 1 - fade_in, fade_in)
+
+    @staticmethod
+    def _end(track: ChainedTrack, error: Exception | None = None) -> None:
+        if track.ended:
+            return
+        track.ended = True
+        try:
+            track.source.cleanup()
+        finally:
+            track.on_end(error)
+
+
+def _mix(first: bytes, second: bytes, first_gain: float, second_gain: float) -> bytes:
+    """Mix two frames of signed 16-bit PCM; a short ``second`` is padded with silence."""
+    mixed = array("h", first)
+    other = array("h", second[: len(first)].ljust(len(first), b"\0"))
+    for index, sample in enumerate(mixed):
+        value = int(sample * first_gain + other[index] * second_gain)
+        mixed[index] = max(-32768, min(32767, value))
+    return mixed.tobytes()
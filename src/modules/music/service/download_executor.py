@@ -0,0 +1,195 @@
+import asyncio
+import itertools
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from attrs import define, field
+
+
+class JobCancelled(Exception):
+    pass
+
+
+@define(eq=False)
+class ExecutorJob:
+    fn: Callable[..., Any]
+    args: tuple
+    future: asyncio.Future
+    priority: int
+    interrupted: threading.Event = field(factory=threading.Event)
+    cancelled: bool = False
+    preempted: bool = False
+    submitted_at: float = field(factory=time.monotonic)
+    started_at: float | None = None
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        self.interrupted.set()
+        if not self.future.done():
+            self.future.cancel()
+
+
+@define
+class DownloadExecutor:
+    """
+    A bounded pool of worker threads that runs blocking yt-dlp work off the event loop.
+
+    Jobs are taken from a priority queue (lower value first). Every job function
+    receives a ``threading.Event`` as its first argument, which is set once the job
+    is cancelled or preempted, so long running downloads can abort early. When all
+    workers are busy, submitting a job preempts the running job with the worst
+    priority; if it aborts with ``JobCancelled``, the preempted job goes back to
+    the queue and resumes later. Pools whose jobs cannot abort and resume safely
+    are created with ``preemptive=False``.
+    """
+
+    max_workers: int = 2
+    preemptive: bool = True
+    _queue: queue.PriorityQueue = field(init=False, factory=queue.PriorityQueue)
+    _workers: list[threading.Thread] = field(init=False, factory=list)
+    _sequence: itertools.count = field(init=False, factory=itertools.count)
+    _pending: set[ExecutorJob] = field(init=False, factory=set)
+    _running: set[ExecutorJob] = field(init=False, factory=set)
+    _preemptions: int = field(init=False, default=0)
+    _lock: threading.Lock = field(init=False, factory=threading.Lock)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def submit(
+        self, fn: Callable[..., Any], *args: Any, priority: int = 0
+    ) -> ExecutorJob:
+        self._start_workers()
+        loop = asyncio.get_running_loop()
+        job = ExecutorJob(
+            fn=fn, args=args, future=loop.create_future(), priority=priority
+        )
+        self._enqueue(job)
+        return job
+
+    def reprioritize(self, job: ExecutorJob, priority: int) -> None:
+        """Move a job that has not started yet to a better priority."""
+        with self._lock:
+            if job not in self._pending or priority >= job.priority:
+                return
+        self._enqueue(job, priority)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, priority: int = 0) -> Any:
+        job = self.submit(fn, *args, priority=priority)
+        try:
+            return await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            active = len(self._running)
+            pending = len(self._pending)
+            preemptions = self._preemptions
+        return {
+            "queue_depth": pending,
+            "active_workers": active,
+            "max_workers": self.max_workers,
+            "utilization": active / self.max_workers,
+            "preemptions": preemptions,
+        }
+
+    def shutdown(self) -> None:
+        for _ in self._workers:
+            self._queue.put((float("inf"), next(self._sequence), None))
+        self._workers = []
+
+    def _enqueue(self, job: ExecutorJob, priority: int | None = None) -> None:
+        with self._lock:
+            if priority is not None:
+                job.priority = priority
+            self._pending.add(job)
+            self._preempt_for(job)
+        self._queue.put((job.priority, next(self._sequence), job))
+
+    def _preempt_for(self, job: ExecutorJob) -> None:
+        if not self.preemptive or len(self._running) < self.max_workers:
+            return
+        victim = max(self._running, key=lambda j: j.priority)
+        if victim.priority <= job.priority or victim.preempted:
+            return
+        self.logger.debug(
+            f"Preempting job with priority {victim.priority} for {job.priority}"
+        )
+        victim.preempted = True
+        victim.interrupted.set()
+        self._preemptions += 1
+
+    def _start_workers(self) -> None:
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker,
+                name=f"download-worker-{len(self._workers)}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _claim(self, job: ExecutorJob) -> bool:
+        with self._lock:
+            if job not in self._pending:
+                return False
+            self._pending.discard(job)
+            if job.cancelled:
+                return False
+            self._running.add(job)
+            return True
+
+    def _worker(self) -> None:
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            if not self._claim(job):
+                continue
+
+            job.started_at = job.started_at or time.monotonic()
+            try:
+                result = job.fn(job.interrupted, *job.args)
+            except BaseException as e:
+                # Only an abort caused by the interrupt is retried; real errors
+                # of a preempted job are reported like any other.
+                aborted = isinstance(e, JobCancelled)
+                if not (aborted and self._requeue_if_preempted(job)):
+                    self._resolve(job, error=e)
+            else:
+                self._resolve(job, result=result)
+            finally:
+                with self._lock:
+                    self._running.discard(job)
+
+    def _requeue_if_preempted(self, job: ExecutorJob) -> bool:
+        with self._lock:
+            if not job.preempted or job.cancelled:
+                return False
+            job.preempted = False
+            job.interrupted.clear()
+            self._running.discard(job)
+        self._enqueue(job)
+        return True
+
+    def _resolve(
+        self, job: ExecutorJob, result: Any = None, error: BaseException | None = None
+    ) -> None:
+        def _set() -> None:
+            if job.future.done():
+                return
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+
+        try:
+            job.future.get_loop().call_soon_threadsafe(_set)
+        except RuntimeError:
+            self.logger.debug("Event loop closed before download job finished")
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable
+
+from attrs import define, field
+
+from .download_executor import DownloadExecutor, ExecutorJob, JobCancelled
+from .music_metrics import DOWNLOAD_JOB_SECONDS, DOWNLOAD_JOBS, DOWNLOAD_PROGRESS
+from .track_identity import track_key
+
+DownloadFn = Callable[[threading.Event, str, "DownloadJob"], tuple[str, str]]
+
+
+@define(eq=False)
+class DownloadJob:
+    key: str
+    url: str
+    executor_job: ExecutorJob | None = None
+    owners: set[int] = field(factory=set)
+    downloaded_bytes: int = 0
+    total_bytes: int | None = None
+    created_at: float = field(factory=time.monotonic)
+    finished_at: float | None = None
+
+    @property
+    def started_at(self) -> float | None:
+        return self.executor_job.started_at if self.executor_job else None
+
+    @property
+    def progress(self) -> float | None:
+        if not self.total_bytes:
+            return None
+        return min(self.downloaded_bytes / self.total_bytes, 1.0)
+
+    @property
+    def queued_seconds(self) -> float:
+        end = self.started_at or self.finished_at or time.monotonic()
+        return end - self.created_at
+
+    @property
+    def run_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def update_progress(self, status: dict) -> None:
+        self.downloaded_bytes = status.get("downloaded_bytes") or self.downloaded_bytes
+        self.total_bytes = (
+            status.get("total_bytes")
+            or status.get("total_bytes_estimate")
+            or self.total_bytes
+        )
+
+
+@define
+class DownloadManager:
+    """
+    Runs at most one download per track and lets every caller await the same job.
+
+    Jobs remember which guilds asked for them; a job is cancelled once the
+    last guild that still has the track queued lets go of it.
+    """
+
+    _executor: DownloadExecutor
+    _download_fn: DownloadFn
+    _jobs: dict[str, DownloadJob] = field(init=False, factory=dict)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        DOWNLOAD_JOBS.collect = self._job_states
+        DOWNLOAD_PROGRESS.collect = self._job_progress
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return track_key(url)
+
+    async def fetch(self, url: str, owner: int, priority: int = 0) -> tuple[str, str]:
+        job = self._jobs.get(self.key_for(url))
+        if job is None:
+            job = self._start(url, priority)
+        else:
+            self.reprioritize(url, priority)
+        job.owners.add(owner)
+
+        assert job.executor_job is not None
+        try:
+            return await asyncio.shield(job.executor_job.future)
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                raise
+            raise JobCancelled(f"Download cancelled: {url}") from None
+
+    def cancel(self, url: str, owner: int) -> None:
+        job = self._jobs.get(self.key_for(url))
+        if job is None:
+            return
+        job.owners.discard(owner)
+        if not job.owners and job.executor_job:
+            self.logger.info(f"Cancelling download of {job.url}")
+            job.executor_job.cancel()
+
+    def reprioritize(self, url: str, priority: int) -> None:
+        job = self._jobs.get(self.key_for(url))
+        if job and job.executor_job:
+            self._executor.reprioritize(job.executor_job, priority)
+
+    def jobs(self) -> list[DownloadJob]:
+        return list(self._jobs.values())
+
+    def _start(self, url: str, priority: int) -> DownloadJob:
+        job = DownloadJob(key=self.key_for(url), url=url)
+        job.executor_job = self._executor.submit(
+            self._download_fn, url, job, priority=priority
+        )
+        job.executor_job.future.add_done_callback(lambda _: self._finish(job))
+        self._jobs[job.key] = job
+        return job
+
+    def _finish(self, job: DownloadJob) -> None:
+        job.finished_at = time.monotonic()
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+
+        future = job.executor_job.future  # type: ignore[union-attr]
+        outcome = (
+            "cancelled"
+            if future.cancelled()
+            else "failed" if future.exception() else "finished"
+        )
+        DOWNLOAD_JOB_SECONDS.observe(
+            job.queued_seconds, phase="queued", outcome=outcome
+        )
+        if job.started_at is not None:
+            DOWNLOAD_JOB_SECONDS.observe(
+                job.run_seconds, phase="running", outcome=outcome
+            )
+        self.logger.debug(
+            f"Download of {job.key} {outcome}: queued {job.queued_seconds:.2f}s, "
+            f"ran {job.run_seconds:.2f}s, {job.downloaded_bytes} bytes"
+        )
+
+    def _job_states(self) -> dict[tuple[str, ...], float]:
+        jobs = self.jobs()
+        running = sum(job.started_at is not None for job in jobs)
+        return {("queued",): len(jobs) - running, ("running",): running}
+
+    def _job_progress(self) -> dict[tuple[str, ...], float]:
+        return {
+            (job.key,): job.progress for job in self.jobs() if job.progress is not None
+        }
@@ -0,0 +1,93 @@
+import logging
+import threading
+from itertools import islice
+from typing import Iterator
+
+from attrs import define, field
+from yt_dlp import YoutubeDL  # type: ignore[import-untyped]
+
+from .download_executor import DownloadExecutor
+
+BASE_YDL_OPTS = {
+    "quiet": True,
+    "no_warnings": True,
+    "skip_download": True,
+    "noplaylist": True,
+    "extractor_args": {"youtube": {"player_client": ["android"]}},
+}
+FLAT_YDL_OPTS = {**BASE_YDL_OPTS, "noplaylist": False, "extract_flat": "in_playlist"}
+
+
+@define
+class ExtractorPool:
+    """
+    Long-lived YoutubeDL instances that resolve metadata without spawning yt-dlp processes.
+
+    Each worker thread keeps its own YoutubeDL objects, so the extractor setup cost is
+    paid once per worker instead of once per lookup.
+    """
+
+    concurrency: int = 4
+    _executor: DownloadExecutor = field(init=False)
+    _local: threading.local = field(init=False, factory=threading.local)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # Extraction ignores interrupts and reading entries consumes a shared
+        # generator, so these jobs are never preempted and retried.
+        self._executor = DownloadExecutor(
+            max_workers=self.concurrency, preemptive=False
+        )
+
+    async def extract(
+        self, url: str, flat: bool = False, process: bool = True, priority: int = 0
+    ) -> dict:
+        """Return the JSON-serializable info dict of a video or playlist."""
+        return await self._executor.run(
+            self._extract_blocking, url, flat, process, priority=priority
+        )
+
+    async def open_playlist(self, url: str) -> tuple[dict, Iterator[dict]]:
+        """Return the playlist info and a lazy iterator over its flat entries."""
+        return await self._executor.run(self._open_playlist_blocking, url)
+
+    async def read_entries(self, entries: Iterator[dict], count: int) -> list[dict]:
+        return await self._executor.run(self._read_entries_blocking, entries, count)
+
+    def stats(self) -> dict[str, float]:
+        return self._executor.stats()
+
+    def _extract_blocking(
+        self, interrupted: threading.Event, url: str, flat: bool, process: bool
+    ) -> dict:
+        ydl = self._get_ydl(flat)
+        info = ydl.extract_info(url, download=False, process=process)
+        return ydl.sanitize_info(info)
+
+    def _open_playlist_blocking(
+        self, interrupted: threading.Event, url: str
+    ) -> tuple[dict, Iterator[dict]]:
+        # The entries generator keeps using the YoutubeDL that created it, so it
+        # gets its own instance instead of one shared by the worker thread.
+        ydl = YoutubeDL(FLAT_YDL_OPTS)
+        info = ydl.extract_info(url, download=False, process=False)
+        while info.get("_type") in ("url", "url_transparent"):
+            info = ydl.extract_info(
+                info["url"], ie_key=info.get("ie_key"), download=False, process=False
+            )
+        entries = info.pop("entries", None) or []
+        return ydl.sanitize_info(info), iter(entries)
+
+    def _read_entries_blocking(
+        self, interrupted: threading.Event, entries: Iterator[dict], count: int
+    ) -> list[dict]:
+        return list(islice(entries, count))
+
+    def _get_ydl(self, flat: bool) -> YoutubeDL:
+        instances = getattr(self._local, "instances", None)
+        if instances is None:
+            instances = self._local.instances = {}
+        if flat not in instances:
+            instances[flat] = YoutubeDL(FLAT_YDL_OPTS if flat else BASE_YDL_OPTS)
+        return instances[flat]
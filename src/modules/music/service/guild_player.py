@@ -0,0 +1,73 @@
+import asyncio
+from collections import deque
+
+from attrs import define, field
+from discord import VoiceClient
+
+from .track_queue import TrackQueue
+from .yt_playlist_handler import PlaylistCursor, Queue
+
+
+@define
+class GuildPlayer:
+    """
+    Playback state of a single guild: its queue, voice client and background tasks.
+    """
+
+    guild_id: int
+    voice_client: VoiceClient | None = None
+    queue_list: TrackQueue = field(factory=TrackQueue)
+    current_track: Queue | None = None
+    # Taken off the queue by gapless playback and being opened to follow current_track.
+    up_next: Queue | None = None
+    requested_at: float | None = None
+    playlist_cursors: deque[PlaylistCursor] = field(factory=deque)
+    playlist_task: asyncio.Task | None = None
+    playback_task: asyncio.Task | None = None
+    queue_updated: asyncio.Event = field(factory=asyncio.Event)
+    track_finished: asyncio.Event = field(factory=asyncio.Event)
+
+    def is_playing(self) -> bool:
+        return self.voice_client is not None and self.voice_client.is_playing()
+
+    def enqueue(self, track: Queue) -> None:
+        self.queue_list.append(track)
+        self.queue_updated.set()
+
+    def enqueue_many(self, tracks: list[Queue]) -> None:
+        if not tracks:
+            return
+        self.queue_list.extend(tracks)
+        self.queue_updated.set()
+
+    async def next_track(self) -> Queue:
+        """Wait until the queue has a track and pop it from the front."""
+        while not self.queue_list:
+            self.queue_updated.clear()
+            await self.queue_updated.wait()
+        return self.queue_list.popleft()
+
+    def pending_playlist_tracks(self) -> int | None:
+        """Tracks of lazily expanded playlists not loaded yet, None if unknown."""
+        remaining = [cursor.remaining for cursor in self.playlist_cursors]
+        if any(count is None for count in remaining):
+            return None
+        return sum(count for count in remaining if count is not None)
+
+    def clear(self) -> None:
+        self.queue_list.clear()
+        self.playlist_cursors.clear()
+        self.up_next = None
+        if self.playlist_task:
+            self.playlist_task.cancel()
+            self.playlist_task = None
+
+    def shuffle(self) -> None:
+        self.queue_list.shuffle()
+
+    def cancel_tasks(self) -> None:
+        for task in (self.playlist_task, self.playback_task):
+            if task and not task.done():
+                task.cancel()
+        self.playlist_task = None
+        self.playback_task = None
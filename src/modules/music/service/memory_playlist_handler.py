@@ -1,45 +1,37 @@
+import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
 
-from attrs import define
+from attrs import define, field
 from discord.ext.commands import Context
 
+from .pagination import Paginator, send_paginated
+from .playlist_store import PlaylistRepository, SqlitePlaylistStore
+from .track_identity import identify
 from .yt_playlist_handler import YtPlaylistHandler
 
-PLAYLIST_FILE = Path(__file__).resolve().parent.parent / "static" / "playlists.json"
 PLAYLIST_LOG_FILE = (
     Path(__file__).resolve().parent.parent / "static" / "playlists_changes.jsonl"
 )
+MAX_LISTED_TRACKS = 15
+PLAYLISTS_PAGE_SIZE = 3
+PLAYLIST_TRACKS_PAGE_SIZE = 10
 
 
 @define
 class MemoryPlaylistHandler:
+    _yt_playlist_handler: YtPlaylistHandler = field(factory=YtPlaylistHandler)
+    _store: PlaylistRepository = field(factory=SqlitePlaylistStore)
+    _pages: dict[int | None, Paginator] = field(init=False, factory=dict)
+    _playlist_count: int = field(init=False, default=0)
+
     async def get_playlist_by_id(self, playlist_id: int) -> dict:
-        playlist_id -= 1
-        playlists = self._load_playlists()
-        for p in playlists:
-            if p["id"] == playlist_id:
-                return p
-        return {}
-
-    def _load_playlists(self) -> list[dict]:
-        if not PLAYLIST_FILE.exists():
-            with open(PLAYLIST_FILE, "w", encoding="utf-8") as f:
-                json.dump([], f, indent=4)
-            return []
-        with open(PLAYLIST_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-
-    def _save_playlists(self, playlists: list[dict]):
-        with open(PLAYLIST_FILE, "w", encoding="utf-8") as f:
-            json.dump(playlists, f, indent=4)
+        playlist = await asyncio.to_thread(self._store.get_playlist, playlist_id - 1)
+        return playlist or {}
 
     async def create_playlist(self, ctx: Context, name: str):
-        playlists = self._load_playlists()
-        new_id = max((p["id"] for p in playlists), default=-1) + 1
-        playlists.append({"id": new_id, "title": name, "data": []})
-        self._save_playlists(playlists)
+        new_id = await asyncio.to_thread(self._store.create_playlist, name)
 
         await ctx.send(f"Playlist '{name}' created with ID {new_id + 1}!")
 
@@ -50,20 +42,12 @@ class MemoryPlaylistHandler:
         )
 
     async def delete_playlist(self, ctx: Context, playlist_id: int):
-        playlists = self._load_playlists()
-        json_playlist_id = playlist_id - 1
+        removed = await asyncio.to_thread(self._store.delete_playlist, playlist_id - 1)
 
-        if json_playlist_id < 0 or json_playlist_id >= len(playlists):
+        if removed is None:
             await ctx.send(f"Playlist with ID {playlist_id} not found.")
             return
 
-        removed = playlists.pop(json_playlist_id)
-
-        for new_idx, playlist in enumerate(playlists):
-            playlist["id"] = new_idx
-
-        self._save_playlists(playlists)
-
         await ctx.send(f"Playlist '{removed['title']}' has been deleted.")
 
         self._log_change(
@@ -73,106 +57,137 @@ class MemoryPlaylistHandler:
         )
 
     async def add_to_playlist(self, ctx: Context, playlist_id: int, url: str):
-        playlists = self._load_playlists()
-        json_playlist_id = playlist_id - 1
-        if "list=" in url:
-            title = await YtPlaylistHandler._fetch_playlist_title_from_url(url)
+        ref = identify(url)
+        if ref is None:
+            await ctx.send(f"Not a valid URL: '{url}'.")
+            return
+
+        url = ref.url
+        if ref.is_playlist:
+            title = await self._yt_playlist_handler._fetch_playlist_title_from_url(url)
         else:
-            title = await YtPlaylistHandler._fetch_title_from_url(url)
+            title = await self._yt_playlist_handler._fetch_title_from_url(url)
 
-        for p in playlists:
-            if p["id"] == json_playlist_id:
-                new_item_id = max((item["id"] for item in p["data"]), default=-1) + 1
-                new_item = {"id": new_item_id, "url": url, "title": title}
-
-                p["data"].append(new_item)
-                self._save_playlists(playlists)
-
-                await ctx.send(f"Added '{title}' to playlist '{p['title']}'")
-                self._log_change(
-                    user=str(ctx.author),
-                    action="ADD_TRACK",
-                    details={"playlist_id": playlist_id, "title": title, "url": url},
-                )
-                return
-        await ctx.send(f"Playlist with ID {playlist_id} not found.")
+        added = await asyncio.to_thread(
+            self._store.add_track, playlist_id - 1, url, title
+        )
+        if added is None:
+            await ctx.send(f"Playlist with ID {playlist_id} not found.")
+            return
+
+        await ctx.send(f"Added '{title}' to playlist '{added['playlist_title']}'")
+        self._log_change(
+            user=str(ctx.author),
+            action="ADD_TRACK",
+            details={"playlist_id": playlist_id, "title": title, "url": url},
+        )
 
     async def remove_from_playlist(self, ctx: Context, playlist_id: int, track_id: int):
-        playlists = self._load_playlists()
-        json_playlist_id = playlist_id - 1
-        json_track_id = track_id - 1
-        for p in playlists:
-            if p["id"] == json_playlist_id:
-                for idx, item in enumerate(p["data"]):
-                    if item["id"] == json_track_id:
-                        removed = p["data"].pop(idx)
-                        for new_idx, track in enumerate(p["data"]):
-                            track["id"] = new_idx
-
-                        self._save_playlists(playlists)
-
-                        await ctx.send(
-                            f"Removed '{removed['title']}' from playlist '{p['title']}'"
-                        )
-
-                        self._log_change(
-                            user=str(ctx.author),
-                            action="REMOVE_TRACK",
-                            details={
-                                "playlist_id": playlist_id,
-                                "removed_title": removed["title"],
-                            },
-                        )
-                        return
-                await ctx.send(
-                    f"Item with ID {track_id} not found in playlist '{p['title']}'"
-                )
-                return
-        await ctx.send(f"Playlist with ID {playlist_id} not found.")
+        removed = await asyncio.to_thread(
+            self._store.remove_track, playlist_id - 1, track_id - 1
+        )
+        if removed is None:
+            await ctx.send(f"Playlist with ID {playlist_id} not found.")
+            return
+        if "title" not in removed:
+            await ctx.send(
+                f"Item with ID {track_id} not found in playlist '{removed['playlist_title']}'"
+            )
+            return
+
+        await ctx.send(
+            f"Removed '{removed['title']}' from playlist '{removed['playlist_title']}'"
+        )
+
+        self._log_change(
+            user=str(ctx.author),
+            action="REMOVE_TRACK",
+            details={
+                "playlist_id": playlist_id,
+                "removed_title": removed["title"],
+            },
+        )
 
     async def show_playlists(self, ctx: Context):
-        playlists = self._load_playlists()
-        if not playlists:
+        self._playlist_count = await asyncio.to_thread(self._store.count_playlists)
+        if not self._playlist_count:
             await ctx.send("No playlists found.")
             return
 
-        display_lines = []
+        paginator = self._pages.get(None)
+        if paginator is None:
+            paginator = self._pages[None] = Paginator(
+                title="Playlists",
+                fetch=self._playlists_page,
+                count=lambda: self._playlist_count,
+                version=lambda: self._store.version,
+                page_size=PLAYLISTS_PAGE_SIZE,
+            )
+        await send_paginated(ctx, paginator)
+
+    async def show_playlist_content(self, ctx: Context, playlist_id: int):
+        p = await asyncio.to_thread(
+            self._store.get_playlist_page, playlist_id - 1, 0, 1
+        )
+        if p is None:
+            await ctx.send(f"Playlist with ID {playlist_id} not found.")
+            return
 
+        if not p["count"]:
+            await ctx.send(f"Playlist '{p['title']}' is empty.")
+            return
+
+        paginator = self._pages.get(playlist_id)
+        if paginator is None or paginator.title != f"Playlist '{p['title']}'":
+            paginator = self._pages[playlist_id] = self._playlist_paginator(
+                playlist_id, p["title"]
+            )
+        await send_paginated(ctx, paginator)
+
+    async def _playlists_page(self, offset: int, limit: int) -> list[str]:
+        self._playlist_count = await asyncio.to_thread(self._store.count_playlists)
+        playlists = await asyncio.to_thread(
+            self._store.list_playlists, MAX_LISTED_TRACKS, offset, limit
+        )
+        display_lines = []
         for p in playlists:
-            num_songs = len(p["data"])
             user_playlist_id = p["id"] + 1
-            if num_songs > 15:
+            if p["count"] > MAX_LISTED_TRACKS:
                 display_lines.append(
-                    f"{user_playlist_id}. {p['title']} (over 15 songs)"
+                    f"{user_playlist_id}. {p['title']} ({p['count']} songs)"
                 )
             else:
                 display_lines.append(f"{user_playlist_id}. {p['title']}")
                 for item in p["data"]:
                     display_lines.append(f"    {item['id'] + 1}. {item['title']}")
-
             display_lines.append("-" * 40)
 
-        if display_lines and display_lines[-1] == "-" * 20:
+        if display_lines:
             display_lines.pop()
-
-        await ctx.send("Playlists:\n" + "\n".join(display_lines))
-
-    async def show_playlist_content(self, ctx: Context, playlist_id: int):
-        json_playlist_id = playlist_id - 1
-        playlists = self._load_playlists()
-        for p in playlists:
-            if p["id"] == json_playlist_id:
-                if not p["data"]:
-                    await ctx.send(f"Playlist '{p['title']}' is empty.")
-                    return
-
-                display = "\n".join(
-                    f"{item['id'] + 1}. {item['title']} ({item['url']})"
-                    for item in p["data"]
-                )
-                await ctx.send(f"Playlist '{p['title']}':\n{display}")
-                return
-        await ctx.send(f"Playlist with ID {playlist_id} not found.")
+        return display_lines
+
+    def _playlist_paginator(self, playlist_id: int, title: str) -> Paginator:
+        counts: dict[str, int] = {"count": 0}
+
+        async def fetch(offset: int, limit: int) -> list[str]:
+            p = await asyncio.to_thread(
+                self._store.get_playlist_page, playlist_id - 1, offset, limit
+            )
+            if p is None:
+                return []
+            counts["count"] = p["count"]
+            return [
+                f"{item['id'] + 1}. {item['title']} ({item['url']})"
+                for item in p["data"]
+            ]
+
+        return Paginator(
+            title=f"Playlist '{title}'",
+            fetch=fetch,
+            count=lambda: counts["count"],
+            version=lambda: self._store.version,
+            page_size=PLAYLIST_TRACKS_PAGE_SIZE,
+        )
 
     def _log_change(self, user: str, action: str, details: dict):
         log_entry = {
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+import discord
+from attrs import define, field
+from discord.ext.commands import Context
+
+MAX_MESSAGE_LENGTH = 2000
+MAX_LISTED_TITLES = 10
+
+
+@define
+class Notice:
+    kind: str
+    text: str
+
+
+@define(eq=False)
+class ChannelOutbox:
+    ctx: Context
+    pending: list[Notice] = field(factory=list)
+    sent_at: deque[float] = field(factory=deque)
+    task: asyncio.Task | None = None
+    last_message: discord.Message | None = None
+    last_queued: list[str] = field(factory=list)
+    last_sent: float = 0.0
+
+
+@define
+class MessageDispatcher:
+    """
+    Sends the music notifications of every channel without making callers wait.
+
+    Notices that arrive within ``debounce_seconds`` of each other go out as one
+    message. "queued" notices collapse into a single summary, which is edited
+    rather than re-sent while a burst lasts for up to ``edit_window_seconds``.
+    Of several "now_playing" notices only the latest is kept. Each channel sends
+    at most ``rate_limit`` messages per ``rate_period_seconds``, Discord's
+    per-channel bucket; notices arriving meanwhile are merged into the next one.
+    """
+
+    debounce_seconds: float = 0.5
+    rate_limit: int = 5
+    rate_period_seconds: float = 5.0
+    edit_window_seconds: float = 15.0
+    _outboxes: dict[int, ChannelOutbox] = field(init=False, factory=dict)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def notify(self, ctx: Context, text: str, kind: str = "info") -> None:
+        outbox = self._outboxes.get(ctx.channel.id)
+        if outbox is None:
+            outbox = self._outboxes[ctx.channel.id] = ChannelOutbox(ctx=ctx)
+        outbox.pending.append(Notice(kind=kind, text=text))
+        if outbox.task is None or outbox.task.done():
+            outbox.task = asyncio.create_task(self._drain(outbox))
+
+    async def _drain(self, outbox: ChannelOutbox) -> None:
+        while outbox.pending:
+            await asyncio.sleep(self.debounce_seconds)
+            await self._wait_for_slot(outbox)
+            notices, outbox.pending = outbox.pending, []
+            try:
+                await self._deliver(outbox, notices)
+            except discord.HTTPException as e:
+                self.logger.warning(
+                    f"Could not send {len(notices)} notices to {outbox.ctx.channel}: {e}"
+                )
+
+    async def _wait_for_slot(self, outbox: ChannelOutbox) -> None:
+        while True:
+            now = time.monotonic()
+            while (
+                outbox.sent_at and now - outbox.sent_at[0] >= self.rate_period_seconds
+            ):
+                outbox.sent_at.popleft()
+            if len(outbox.sent_at) < self.rate_limit:
+                return
+            await asyncio.sleep(self.rate_period_seconds - (now - outbox.sent_at[0]))
+
+    async def _deliver(self, outbox: ChannelOutbox, notices: list[Notice]) -> None:
+        queued = [notice.text for notice in notices if notice.kind == "queued"]
+        now_playing = [notice for notice in notices if notice.kind == "now_playing"]
+        others = [
+            notice.text
+            for notice in notices
+            if notice.kind not in ("queued", "now_playing")
+        ]
+
+        only_queued = not others and not now_playing
+        if queued and only_queued and self._can_edit(outbox):
+            try:
+                await self._edit(
+                    outbox, self._queued_summary(outbox.last_queued + queued)
+                )
+                outbox.last_queued += queued
+                return
+            except discord.HTTPException as e:
+                self.logger.debug(f"Could not edit queue summary, sending anew: {e}")
+
+        lines = list(others)
+        if queued:
+            lines.append(self._queued_summary(queued))
+        if now_playing:
+            lines.append(now_playing[-1].text)
+        message = None
+        for chunk in self._chunks(lines):
+            message = await self._send(outbox, chunk)
+        outbox.last_message = message
+        outbox.last_queued = queued if only_queued else []
+
+    def _can_edit(self, outbox: ChannelOutbox) -> bool:
+        return (
+            outbox.last_message is not None
+            and bool(outbox.last_queued)
+            and time.monotonic() - outbox.last_sent < self.edit_window_seconds
+        )
+
+    async def _send(
+        self, outbox: ChannelOutbox, content: str
+    ) -> discord.Message | None:
+        outbox.sent_at.append(time.monotonic())
+        outbox.last_sent = time.monotonic()
+        return await outbox.ctx.send(content)
+
+    async def _edit(self, outbox: ChannelOutbox, content: str) -> None:
+        assert outbox.last_message is not None
+        outbox.sent_at.append(time.monotonic())
+        await outbox.last_message.edit(content=content)
+
+    @staticmethod
+    def _queued_summary(titles: list[str]) -> str:
+        if len(titles) == 1:
+            return f"Added to queue: {titles[0]}"
+        listed = ", ".join(titles[:MAX_LISTED_TITLES])
+        more = len(titles) - MAX_LISTED_TITLES
+        suffix = f" and {more} more" if more > 0 else ""
+        return f"Added {len(titles)} songs to queue: {listed}{suffix}"[
+            :MAX_MESSAGE_LENGTH
+        ]
+
+    @staticmethod
+    def _chunks(lines: list[str]) -> list[str]:
+        chunks: list[str] = []
+        current = ""
+        for line in lines:
+            line = line[:MAX_MESSAGE_LENGTH]
+            if current and len(current) + 1 + len(line) > MAX_MESSAGE_LENGTH:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n{line}" if current else line
+        if current:
+            chunks.append(current)
+        return chunks
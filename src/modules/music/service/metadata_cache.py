@@ -0,0 +1,221 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from attrs import define, field
+
+from .music_metrics import CACHE_REQUESTS
+
+METADATA_DB_FILE = (
+    Path(__file__).resolve().parent.parent / "static" / "metadata_cache.sqlite3"
+)
+KEPT_INFO_FIELDS = (
+    "id",
+    "title",
+    "duration",
+    "thumbnail",
+    "extractor",
+    "extractor_key",
+    "webpage_url",
+    "webpage_url_basename",
+    "webpage_url_domain",
+    "original_url",
+    "live_status",
+    "formats",
+    "http_headers",
+    "entries",
+)
+
+
+@define
+class TrackMetadata:
+    key: str
+    info: dict
+    static_expires_at: float
+    stream_expires_at: float
+
+    @property
+    def title(self) -> str:
+        return self.info.get("title") or "Unknown title"
+
+    @property
+    def duration(self) -> float | None:
+        return self.info.get("duration")
+
+    @property
+    def thumbnail(self) -> str | None:
+        return self.info.get("thumbnail")
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.static_expires_at
+
+    def has_streams(self) -> bool:
+        return bool(self.info.get("formats")) and time.time() < self.stream_expires_at
+
+
+@define
+class MetadataCache:
+    """
+    Video metadata cached in an in-memory LRU tier backed by SQLite.
+
+    Static fields (title, duration, thumbnail) live for ``static_ttl_seconds``;
+    the stream formats expire after ``stream_ttl_seconds`` because their URLs
+    are signed and short lived.
+    """
+
+    db_file: Path = METADATA_DB_FILE
+    memory_entries: int = 1024
+    static_ttl_seconds: int = 7 * 24 * 3600
+    stream_ttl_seconds: int = 3600
+    _memory: OrderedDict[str, TrackMetadata] = field(init=False, factory=OrderedDict)
+    _connection: sqlite3.Connection | None = field(init=False, default=None)
+    _lock: threading.RLock = field(init=False, factory=threading.RLock)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @staticmethod
+    def key_for(info: dict) -> str:
+        return f"{info.get('extractor_key', 'generic')}-{info['id']}"
+
+    async def aget(self, key: str | None) -> TrackMetadata | None:
+        if key is None:
+            return None
+        with self._lock:
+            metadata = self._get_from_memory(key)
+        if metadata is not None:
+            CACHE_REQUESTS.inc(cache="metadata", result="hit")
+            return metadata
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(
+        self, info: dict, static_ttl_seconds: int | None = None
+    ) -> TrackMetadata:
+        return await asyncio.to_thread(self.put, info, static_ttl_seconds)
+
+    def peek(self, key: str | None) -> TrackMetadata | None:
+        """Look up the in-memory tier only, without touching the database."""
+        if key is None:
+            return None
+        with self._lock:
+            return self._get_from_memory(key)
+
+    def get(self, key: str | None) -> TrackMetadata | None:
+        if key is None:
+            return None
+        with self._lock:
+            metadata = self._get_from_memory(key)
+            if metadata is None:
+                metadata = self._get_from_disk(key)
+                if metadata is not None:
+                    self._remember(metadata)
+            result = "miss" if metadata is None else "hit"
+            CACHE_REQUESTS.inc(cache="metadata", result=result)
+            return metadata
+
+    def put(self, info: dict, static_ttl_seconds: int | None = None) -> TrackMetadata:
+        now = time.time()
+        static_ttl = static_ttl_seconds or self.static_ttl_seconds
+        kept = {k: info[k] for k in KEPT_INFO_FIELDS if k in info}
+        kept["formats"] = [
+            fmt
+            for fmt in info.get("formats") or []
+            if fmt.get("acodec") not in (None, "none")
+        ]
+        metadata = TrackMetadata(
+            key=self.key_for(info),
+            info=kept,
+            static_expires_at=now + static_ttl,
+            stream_expires_at=now + self.stream_ttl_seconds,
+        )
+        with self._lock:
+            self._remember(metadata)
+            try:
+                self._db().execute(
+                    "INSERT OR REPLACE INTO metadata "
+                    "(key, info, static_expires_at, stream_expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        metadata.key,
+                        json.dumps(metadata.info),
+                        metadata.static_expires_at,
+                        metadata.stream_expires_at,
+                    ),
+                )
+                self._db().commit()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Could not persist metadata {metadata.key}: {e}")
+        return metadata
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._db().execute(
+                "DELETE FROM metadata WHERE static_expires_at < ?", (time.time(),)
+            )
+            self._db().commit()
+            return cursor.rowcount
+
+    def _get_from_memory(self, key: str) -> TrackMetadata | None:
+        metadata = self._memory.get(key)
+        if metadata is None:
+            return None
+        if not metadata.is_fresh():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return metadata
+
+    def _get_from_disk(self, key: str) -> TrackMetadata | None:
+        try:
+            row = (
+                self._db()
+                .execute(
+                    "SELECT info, static_expires_at, stream_expires_at "
+                    "FROM metadata WHERE key = ?",
+                    (key,),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not read metadata {key}: {e}")
+            return None
+
+        if row is None:
+            return None
+        metadata = TrackMetadata(
+            key=key,
+            info=json.loads(row[0]),
+            static_expires_at=row[1],
+            stream_expires_at=row[2],
+        )
+        return metadata if metadata.is_fresh() else None
+
+    def _remember(self, metadata: TrackMetadata) -> None:
+        self._memory[metadata.key] = metadata
+        self._memory.move_to_end(metadata.key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.db_file.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "key TEXT PRIMARY KEY, "
+                "info TEXT NOT NULL, "
+                "static_expires_at REAL NOT NULL, "
+                "stream_expires_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "DELETE FROM metadata WHERE static_expires_at < ?", (time.time(),)
+            )
+            self._connection.commit()
+        return self._connection
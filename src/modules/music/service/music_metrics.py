@@ -0,0 +1,77 @@
+from src.modules.metrics import REGISTRY
+
+FIRST_AUDIO_SECONDS = REGISTRY.histogram(
+    "music_command_to_first_audio_seconds",
+    "Time from a play command on an idle player until audio starts",
+)
+EXTRACTION_SECONDS = REGISTRY.histogram(
+    "music_extraction_seconds",
+    "Time spent resolving metadata with yt-dlp",
+    labels=("kind",),
+)
+DOWNLOAD_SECONDS = REGISTRY.histogram(
+    "music_download_seconds",
+    "Time playback waited for a track to be downloaded",
+)
+DOWNLOAD_JOB_SECONDS = REGISTRY.histogram(
+    "music_download_job_seconds",
+    "Time download jobs spent queued and running, by phase and outcome",
+    labels=("phase", "outcome"),
+)
+DOWNLOAD_JOBS = REGISTRY.gauge(
+    "music_download_jobs", "Download jobs in flight by state", labels=("state",)
+)
+DOWNLOAD_PROGRESS = REGISTRY.gauge(
+    "music_download_progress_ratio",
+    "Downloaded share of each in-flight download whose size is known",
+    labels=("track",),
+)
+DOWNLOADED_BYTES = REGISTRY.counter(
+    "music_downloaded_bytes_total", "Bytes of audio downloaded"
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "music_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss)",
+    labels=("cache", "result"),
+)
+CACHE_EVICTIONS = REGISTRY.counter(
+    "music_cache_evictions_total",
+    "Files removed from the audio cache, by reason (size or untracked)",
+    labels=("reason",),
+)
+QUEUE_LENGTH = REGISTRY.gauge(
+    "music_queue_length", "Tracks waiting in each guild queue", labels=("guild",)
+)
+VOICE_CONNECTIONS = REGISTRY.gauge("music_voice_connections", "Connected voice clients")
+VOICE_CONNECTS = REGISTRY.counter(
+    "music_voice_connects_total",
+    "Voice connections requested by commands, by result (new, moved or reused)",
+    labels=("result",),
+)
+WORKER_QUEUE_DEPTH = REGISTRY.gauge(
+    "music_worker_queue_depth",
+    "Jobs waiting for a worker thread, by pool (download or extractor)",
+    labels=("pool",),
+)
+WORKER_UTILIZATION = REGISTRY.gauge(
+    "music_worker_utilization",
+    "Share of worker threads running a job, by pool (download or extractor)",
+    labels=("pool",),
+)
+FFMPEG_PROCESSES = REGISTRY.gauge(
+    "music_ffmpeg_processes", "FFmpeg processes feeding voice clients"
+)
+BACKGROUND_TASKS = REGISTRY.gauge(
+    "music_background_tasks", "Running background tasks by kind", labels=("kind",)
+)
+TASK_SECONDS = REGISTRY.histogram(
+    "music_task_seconds",
+    "Lifetime of background tasks, from spawn until done",
+    labels=("kind",),
+    buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0, 3600.0),
+)
+TASKS_REJECTED = REGISTRY.counter(
+    "music_tasks_rejected_total",
+    "Commands rejected because their guild had too much work in flight",
+    labels=("kind",),
+)
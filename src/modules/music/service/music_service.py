@@ -1,42 +1,133 @@
 import asyncio
 import logging
-import os
-from random import shuffle
-from urllib.parse import urlparse
+import threading
+import time
+from functools import partial
+from pathlib import Path
 
 import discord
 from attrs import define, field
-from discord import VoiceClient, VoiceProtocol
+from discord import VoiceClient
 from discord.ext.commands import Context
 from yt_dlp import YoutubeDL  # type: ignore[import-untyped]
 
+from ..settings import MusicSettings
+from .audio_cache import AudioCache
+from .audio_source import (
+    FRAME_MILLISECONDS,
+    AudioFormat,
+    ChainedTrack,
+    GaplessSource,
+    build_audio_source,
+    probe_format,
+)
+from .download_executor import DownloadExecutor, JobCancelled
+from .download_manager import DownloadJob, DownloadManager
+from .extractor_pool import ExtractorPool
+from .guild_player import GuildPlayer
 from .memory_playlist_handler import MemoryPlaylistHandler
+from .message_dispatcher import MessageDispatcher
+from .metadata_cache import MetadataCache, TrackMetadata
+from .music_metrics import (
+    DOWNLOAD_SECONDS,
+    DOWNLOADED_BYTES,
+    EXTRACTION_SECONDS,
+    FFMPEG_PROCESSES,
+    FIRST_AUDIO_SECONDS,
+    QUEUE_LENGTH,
+    VOICE_CONNECTIONS,
+    WORKER_QUEUE_DEPTH,
+    WORKER_UTILIZATION,
+)
+from .pagination import Paginator, send_paginated
+from .prefetch_scheduler import PLAYBACK_PRIORITY, PrefetchScheduler
+from .task_supervisor import TaskSupervisor
+from .track_identity import identify
+from .voice_connections import VoiceConnectionManager
 from .yt_playlist_handler import Queue, YtPlaylistHandler
 
+QUEUE_PAGE_SIZE = 20
+
 
 # mypy: disable_error_code="union-attr"
 @define
 class MusicService:
     _yt_playlist_handler: YtPlaylistHandler = field(init=False)
     _memory_playlist_handler: MemoryPlaylistHandler = field(init=False)
-    _queue_list: list[Queue] = field(factory=list)
-    _playlist_task: asyncio.Task | None = None
-    _downloads_dir = "./downloads"
+    _settings: MusicSettings = field(factory=MusicSettings)
+    _download_executor: DownloadExecutor = field(init=False)
+    _extractor_pool: ExtractorPool = field(init=False)
+    _download_manager: DownloadManager = field(init=False)
+    _prefetch_scheduler: PrefetchScheduler = field(init=False)
+    _metadata_cache: MetadataCache = field(init=False)
+    task_supervisor: TaskSupervisor = field(init=False)
+    _messages: MessageDispatcher = field(init=False, factory=MessageDispatcher)
+    _voice: VoiceConnectionManager = field(init=False)
+    _players: dict[int, GuildPlayer] = field(factory=dict)
+    _queue_pages: dict[int, Paginator] = field(init=False, factory=dict)
+    _audio_cache: AudioCache = field(factory=AudioCache)
     logger: logging.Logger = field(init=False)
 
     def __attrs_post_init__(self) -> None:
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
-        self._yt_playlist_handler = YtPlaylistHandler()
-        self._memory_playlist_handler = MemoryPlaylistHandler()
-
-    async def play(
-        self,
-        ctx: Context,
-        url: str,
-        voice_clients: list[VoiceClient | VoiceProtocol],
-    ) -> None:
+        self._metadata_cache = MetadataCache(
+            memory_entries=self._settings.METADATA_MEMORY_ENTRIES,
+            static_ttl_seconds=self._settings.METADATA_STATIC_TTL_SECONDS,
+            stream_ttl_seconds=self._settings.METADATA_STREAM_TTL_SECONDS,
+        )
+        self._extractor_pool = ExtractorPool(
+            concurrency=self._settings.EXTRACTOR_WORKERS
+        )
+        self._yt_playlist_handler = YtPlaylistHandler(
+            extractor_pool=self._extractor_pool,
+            metadata_cache=self._metadata_cache,
+        )
+        self._memory_playlist_handler = MemoryPlaylistHandler(
+            yt_playlist_handler=self._yt_playlist_handler
+        )
+        self._download_executor = DownloadExecutor()
+        self._download_manager = DownloadManager(
+            executor=self._download_executor,
+            download_fn=self._download_audio_file_blocking,
+        )
+        self._prefetch_scheduler = PrefetchScheduler(
+            download_manager=self._download_manager,
+            audio_cache=self._audio_cache,
+            metadata_cache=self._metadata_cache,
+            max_tracks=self._settings.PREFETCH_TRACKS,
+            max_total_size_mb=self._settings.PREFETCH_MAX_MB,
+        )
+        self.task_supervisor = TaskSupervisor(
+            per_guild_limit=self._settings.COMMAND_CONCURRENCY_PER_GUILD,
+            global_limit=self._settings.COMMAND_CONCURRENCY_GLOBAL,
+            backlog_per_guild=self._settings.COMMAND_BACKLOG_PER_GUILD,
+        )
+        self._voice = VoiceConnectionManager(
+            is_busy=self._is_busy,
+            on_idle=self.release_player,
+            idle_grace_seconds=self._settings.VOICE_IDLE_GRACE_SECONDS,
+        )
+        QUEUE_LENGTH.collect = self._queue_lengths
+        VOICE_CONNECTIONS.collect = self._voice_connections
+        FFMPEG_PROCESSES.collect = self._ffmpeg_processes
+        WORKER_QUEUE_DEPTH.collect = partial(self._worker_stats, "queue_depth")
+        WORKER_UTILIZATION.collect = partial(self._worker_stats, "utilization")
+
+    @property
+    def metadata_cache(self) -> MetadataCache:
+        return self._metadata_cache
+
+    def get_player(self, guild_id: int) -> GuildPlayer:
+        player = self._players.get(guild_id)
+        if player is None:
+            player = GuildPlayer(guild_id=guild_id)
+            self._players[guild_id] = player
+        return player
+
+    async def play(self, ctx: Context, url: str) -> None:
         self.logger.info(f"{ctx.author} requested to play URL: {url}")
-        if not await self._is_valid_url(url):
+        ref = identify(url)
+        if ref is None:
             await ctx.send(f"Not a valid URL: '{url}'. Skipping.")
             self.logger.warning(f"Invalid URL provided: {url}")
             return
@@ -45,36 +136,24 @@ class MusicService:
             await ctx.send("You need to be in a voice channel to play music.")
             return
 
-        channel = ctx.author.voice.channel
-        voice_client = discord.utils.get(voice_clients, guild=ctx.guild)
-        if not voice_client:
-            voice_client = await channel.connect()
+        player = self.get_player(ctx.guild.id)
+        self._mark_requested(player)
+        await self._ensure_voice_client(ctx, player)
 
-        if "list=" in url:
+        if ref.is_playlist:
             self.logger.info("Gathering playlist")
-            self._playlist_task = asyncio.create_task(
-                self._yt_playlist_handler.get_remaining_urls_from_playlist(
-                    url=url, queue_list=self._queue_list, ctx=ctx
-                )
-            )
+            await self._enqueue_playlist(ctx=ctx, url=ref.url, player=player)
 
         else:
-            title = await self._yt_playlist_handler._fetch_title_from_url(url)
+            title = await self._yt_playlist_handler._fetch_title_from_url(ref.url)
             title = title if title else "Unknown title"
-            self._queue_list.append(Queue(url=url, title=title))
-            await ctx.send(f"Added to queue: {title}")
+            player.enqueue(Queue(url=ref.url, title=title))
+            self._schedule_prefetch(player)
+            self._messages.notify(ctx, title, kind="queued")
 
-        if not voice_client.is_playing():
-            while not self._queue_list:
-                await asyncio.sleep(1)
-            asyncio.create_task(self._process_playlist(ctx, voice_client))  # type: ignore[arg-type]
+        self._ensure_playback(ctx, player)
 
-    async def play_from_memory_playlist(
-        self,
-        ctx: Context,
-        playlist_id: int,
-        voice_clients: list[VoiceClient | VoiceProtocol],
-    ) -> None:
+    async def play_from_memory_playlist(self, ctx: Context, playlist_id: int) -> None:
         playlist = await self._memory_playlist_handler.get_playlist_by_id(
             playlist_id=playlist_id
         )
@@ -90,236 +169,664 @@ class MusicService:
             await ctx.send("Playlist is empty.")
             return
 
-        await ctx.send(
-            f"Playing memory playlist '{playlist['title']}' ({len(playlist['data'])} songs)..."
-        )
+        if ctx.author.voice is None:
+            await ctx.send("You need to be in a voice channel to play music.")
+            return
+
+        tracks = []
+        nested_playlists = []
         for item in playlist["data"]:
-            url = item["url"]
-            await self.play(ctx, url, voice_clients)
+            ref = identify(item["url"])
+            url = ref.url if ref else item["url"]
+            if ref and ref.is_playlist:
+                nested_playlists.append(url)
+            else:
+                tracks.append(Queue(url=url, title=item["title"]))
+
+        player = self.get_player(ctx.guild.id)
+        self._mark_requested(player)
+        await self._ensure_voice_client(ctx, player)
+        await self.enqueue_tracks(ctx, player, tracks)
+        self._messages.notify(
+            ctx,
+            f"Playing memory playlist '{playlist['title']}': added {len(tracks)} songs, "
+            f"current queue length: {len(player.queue_list)}",
+        )
+        for url in nested_playlists:
+            await self._enqueue_playlist(ctx=ctx, url=url, player=player)
+
+    async def enqueue_tracks(
+        self, ctx: Context, player: GuildPlayer, tracks: list[Queue]
+    ) -> None:
+        """Append already resolved tracks in one go and make sure playback runs."""
+        player.enqueue_many(tracks)
+        self._schedule_prefetch(player)
+        self._ensure_playback(ctx, player)
 
-    async def skip(self, ctx: Context, voice_clients: list[VoiceClient]) -> None:
+    async def skip(self, ctx: Context) -> None:
         self.logger.info("Skipping")
-        voice_client = discord.utils.get(voice_clients, guild=ctx.guild)
-        if self._queue_list:
+        player = self.get_player(ctx.guild.id)
+        voice_client = player.voice_client
+        gapless_source = self._gapless_source(player)
+        if gapless_source and (player.queue_list or player.up_next):
+            self._cancel_current_download(player)
+            gapless_source.skip()
+        elif player.queue_list and voice_client:
+            self._cancel_current_download(player)
             voice_client.stop()
-            asyncio.create_task(self._process_playlist(ctx, voice_client))  # type: ignore[arg-type]
         elif not voice_client or not voice_client.is_playing():
             await ctx.send("No song is currently playing.")
             return
 
-    async def skip_all(self, ctx: Context, voice_clients: list[VoiceClient]) -> None:
-        voice_client = discord.utils.get(voice_clients, guild=ctx.guild)
-        if self._queue_list:
+    async def skip_all(self, ctx: Context) -> None:
+        player = self.get_player(ctx.guild.id)
+        voice_client = player.voice_client
+        if (player.queue_list or player.up_next) and voice_client:
+            self._cancel_current_download(player)
+            self._cancel_up_next_download(player)
+            # Commands still extracting would refill the queue right after it is cleared.
+            self.task_supervisor.cancel_guild(ctx.guild.id, kinds={"enqueue"})
+            # Empty the queue before stopping: the playback loop wakes as soon as
+            # the track ends and would otherwise pop the next one.
+            await self.clear_queue(ctx.guild.id)
             voice_client.stop()
             await ctx.send("**Queue cleared.**")
-            await self.clear_queue()
-            asyncio.create_task(self._process_playlist(ctx, voice_client))  # type: ignore[arg-type]
         elif not voice_client or not voice_client.is_playing():
             await ctx.send("No song is currently playing.")
             return
 
     async def show_queue(self, ctx: Context) -> None:
-        if not self._queue_list:
+        player = self.get_player(ctx.guild.id)
+        if not player.queue_list and not player.up_next:
             await ctx.send("Queue is empty.")
             return
-
-        queue_display = "\n".join(
-            f"{idx + 1}. {song.title}" for idx, song in enumerate(self._queue_list)
+        await send_paginated(ctx, self._queue_paginator(player))
+
+    def _queue_paginator(self, player: GuildPlayer) -> Paginator:
+        paginator = self._queue_pages.get(player.guild_id)
+        if paginator is not None:
+            return paginator
+
+        async def fetch(offset: int, limit: int) -> list[str]:
+            head = [player.up_next] if player.up_next else []
+            start = max(offset - len(head), 0)
+            tracks = (
+                head[offset : offset + limit]
+                + player.queue_list[start : offset + limit - len(head)]
+            )
+            return [f"{offset + idx + 1}. {t.title}" for idx, t in enumerate(tracks)]
+
+        def footer() -> str | None:
+            pending = player.pending_playlist_tracks()
+            if pending == 0:
+                return None
+            return f"...and {pending or 'more'} playlist tracks still to be loaded"
+
+        paginator = Paginator(
+            title="Current Queue",
+            fetch=fetch,
+            count=lambda: len(player.queue_list) + (player.up_next is not None),
+            version=lambda: hash((player.queue_list.version, player.up_next)),
+            page_size=QUEUE_PAGE_SIZE,
+            footer=footer,
         )
+        self._queue_pages[player.guild_id] = paginator
+        return paginator
+
+    async def clear_queue(self, guild_id: int) -> None:
+        player = self.get_player(guild_id)
+        player.clear()
+        self._schedule_prefetch(player)
+
+    async def release_player(self, guild_id: int) -> None:
+        player = self._players.pop(guild_id, None)
+        self._queue_pages.pop(guild_id, None)
+        self.task_supervisor.cancel_guild(guild_id)
+        self._voice.forget(guild_id)
+        if player:
+            self._cancel_current_download(player)
+            self._cancel_up_next_download(player)
+            self._prefetch_scheduler.cancel_all(guild_id)
+            player.clear()
+            player.cancel_tasks()
+
+    @property
+    def _passthrough(self) -> bool:
+        # Crossfading mixes PCM, so every gapless source has to be decoded.
+        crossfade = self._settings.GAPLESS and self._settings.CROSSFADE_SECONDS > 0
+        return self._settings.OPUS_PASSTHROUGH and not crossfade
+
+    def _mark_requested(self, player: GuildPlayer) -> None:
+        if player.current_track is None:
+            player.requested_at = time.monotonic()
+
+    def _is_busy(self, guild_id: int) -> bool:
+        player = self._players.get(guild_id)
+        if player is None:
+            return False
+        return (
+            player.current_track is not None
+            or player.up_next is not None
+            or bool(player.queue_list)
+            or bool(player.playlist_cursors)
+            or self.task_supervisor.running(guild_id, kinds={"command", "enqueue"}) > 0
+        )
+
+    def _queue_lengths(self) -> dict[tuple[str, ...], float]:
+        return {
+            (str(guild_id),): len(player.queue_list)
+            for guild_id, player in self._players.items()
+        }
+
+    def _voice_connections(self) -> dict[tuple[str, ...], float]:
+        connected = [
+            player
+            for player in self._players.values()
+            if player.voice_client and player.voice_client.is_connected()
+        ]
+        return {(): len(connected)}
+
+    def _ffmpeg_processes(self) -> dict[tuple[str, ...], float]:
+        running = 0
+        for player in self._players.values():
+            source = player.voice_client.source if player.voice_client else None
+            # A gapless source holds the FFmpeg sources of the tracks it chains.
+            if isinstance(source, GaplessSource):
+                running += sum(
+                    isinstance(s, discord.FFmpegAudio) for s in source.sources()
+                )
+            elif isinstance(source, discord.FFmpegAudio):
+                running += 1
+        return {(): running}
+
+    def _worker_stats(self, stat: str) -> dict[tuple[str, ...], float]:
+        pools = {
+            "download": self._download_executor.stats(),
+            "extractor": self._extractor_pool.stats(),
+        }
+        return {(pool,): stats[stat] for pool, stats in pools.items()}
+
+    def _cancel_current_download(self, player: GuildPlayer) -> None:
+        if player.current_track and not player.is_playing():
+            self._download_manager.cancel(
+                player.current_track.url, owner=player.guild_id
+            )
+
+    def _cancel_up_next_download(self, player: GuildPlayer) -> None:
+        if player.up_next:
+            self._download_manager.cancel(player.up_next.url, owner=player.guild_id)
+
+    async def mix_playlist(self, guild_id: int) -> None:
+        player = self.get_player(guild_id)
+        player.shuffle()
+        self._schedule_prefetch(player)
+
+    async def _enqueue_playlist(
+        self, ctx: Context, url: str, player: GuildPlayer
+    ) -> None:
         try:
-            await ctx.send(f"**Current Queue:**\n{queue_display}")
-        except Exception:
-            await ctx.send(
-                f"**Current Queue is too big to show titles,length:** {len(self._queue_list)}"
+            cursor = await self._yt_playlist_handler.open_playlist(url)
+        except Exception as e:
+            self.logger.error(f"Error opening playlist {url}: {e}")
+            self._messages.notify(ctx, f"Failed to load playlist: {e}")
+            return
+
+        # A playlist queued behind another lazy one waits for its turn, so the
+        # queue keeps the order in which the playlists were requested.
+        waiting = bool(player.playlist_cursors)
+        player.playlist_cursors.append(cursor)
+        if not waiting:
+            await self._load_playlist_page(player)
+
+        total = cursor.total if cursor.total is not None else "unknown"
+        self._messages.notify(
+            ctx,
+            f"**Playlist gathered:** {cursor.title} ({total} songs), "
+            f"current queue length: {len(player.queue_list)}",
+        )
+
+    async def _load_playlist_page(self, player: GuildPlayer) -> None:
+        """
+        Move the next page of the oldest lazy playlist into the queue.
+
+        A page whose entries were all skipped enqueues nothing, and no later
+        refill would be triggered while the queue stays empty, so pages are read
+        until a track is enqueued or no lazy playlist is left.
+        """
+        while player.playlist_cursors:
+            cursor = player.playlist_cursors[0]
+            try:
+                page = await self._yt_playlist_handler.next_page(
+                    cursor, self._settings.PLAYLIST_PAGE_SIZE
+                )
+            except Exception as e:
+                self.logger.error(f"Error reading playlist {cursor.url}: {e}")
+                cursor.exhausted = True
+                page = []
+
+            if cursor not in player.playlist_cursors:
+                return
+            for track in page:
+                player.enqueue(track)
+            if cursor.exhausted:
+                player.playlist_cursors.remove(cursor)
+            self.logger.debug(
+                f"Loaded {len(page)} tracks of {cursor.title}, {cursor.loaded} so far"
             )
+            if page:
+                break
+        self._schedule_prefetch(player)
 
-    async def clear_queue(self) -> None:
-        self._queue_list = []
+    def _ensure_refill(self, player: GuildPlayer) -> None:
+        if not player.playlist_cursors:
+            return
+        if len(player.queue_list) >= self._settings.PLAYLIST_REFILL_BELOW:
+            return
+        if player.playlist_task is None or player.playlist_task.done():
+            player.playlist_task = self.task_supervisor.spawn(
+                self._load_playlist_page(player), player.guild_id, kind="playlist"
+            )
 
-    async def mix_playlist(self) -> None:
-        shuffle(self._queue_list)
+    def _schedule_prefetch(self, player: GuildPlayer) -> None:
+        if self._settings.PLAYBACK_MODE != "stream":
+            self._prefetch_scheduler.schedule(player)
+            return
+        # Placeholders from lazy playlists carry only a flat title; when nothing
+        # is prefetched, resolve their metadata once they near the front instead.
+        upcoming = player.queue_list[: self._settings.PREFETCH_TRACKS]
+        self._yt_playlist_handler.resolve_metadata(
+            [track.url for track in upcoming], self.task_supervisor, player.guild_id
+        )
 
-    async def _process_playlist(self, ctx: Context, voice_client: VoiceClient) -> None:
-        while self._queue_list:
-            if not voice_client.is_playing():
-                next_song = self._queue_list[0]
-                asyncio.create_task(self._prefetch_next_song())
-                await self._play(ctx=ctx, url=next_song.url, voice_client=voice_client)
-                del self._queue_list[0]
-            await asyncio.sleep(2)
+    async def _ensure_voice_client(
+        self, ctx: Context, player: GuildPlayer
+    ) -> VoiceClient:
+        player.voice_client = await self._voice.connect(ctx, player.voice_client)
+        return player.voice_client
+
+    def _ensure_playback(self, ctx: Context, player: GuildPlayer) -> None:
+        if player.playback_task is None or player.playback_task.done():
+            process = (
+                self._process_playlist_gapless
+                if self._settings.GAPLESS
+                else self._process_playlist
+            )
+            player.playback_task = self.task_supervisor.spawn(
+                process(ctx, player), player.guild_id, kind="playback"
+            )
 
-    async def _is_valid_url(self, url: str) -> bool:
+    async def _process_playlist(self, ctx: Context, player: GuildPlayer) -> None:
+        while True:
+            self._ensure_refill(player)
+            next_song = await player.next_track()
+            player.current_track = next_song
+            self._voice.touch(player.guild_id)
+            self._schedule_prefetch(player)
+            if await self._play(ctx=ctx, url=next_song.url, player=player):
+                await player.track_finished.wait()
+            player.current_track = None
+            self._voice.touch(player.guild_id)
+
+    async def _process_playlist_gapless(
+        self, ctx: Context, player: GuildPlayer
+    ) -> None:
+        """
+        Keep one track opened behind the playing one.
+
+        Each track is taken off the queue as soon as the previous one starts,
+        opened and primed, and appended to the GaplessSource of the voice client,
+        which switches to it on the frame the current track ends.
+        """
+        while True:
+            self._ensure_refill(player)
+            next_song = await player.next_track()
+            player.up_next = next_song
+            self._schedule_prefetch(player)
+            await self._play_gapless(ctx, next_song, player)
+            if player.up_next is next_song:
+                player.up_next = None
+
+    async def _play_gapless(
+        self, ctx: Context, song: Queue, player: GuildPlayer
+    ) -> None:
+        """Open ``song``, chain it after the current track and wait until it starts."""
+        crossfade_frames = int(
+            self._settings.CROSSFADE_SECONDS * 1000 / FRAME_MILLISECONDS
+        )
         try:
-            parsed = urlparse(url)
-            return all([parsed.scheme, parsed.netloc])
-        except Exception:
-            return False
+            source, title, file_path = await self._create_source(song.url, player)
+        except JobCancelled:
+            self.logger.info(f"Download of {song.url} cancelled before playback")
+            return
+        except Exception as e:
+            self._messages.notify(ctx, f"Failed to download or play: {e}")
+            self.logger.error(f"Error while playing {song.url}: {e}")
+            return
 
-    async def _prefetch_next_song(self) -> None:
-        if len(self._queue_list) < 2:
+        track = ChainedTrack(source=source)
+        try:
+            await asyncio.to_thread(track.prime, max(crossfade_frames, 1))
+        except asyncio.CancelledError:
+            self._discard_source(source, file_path)
+            raise
+        except Exception as e:
+            self._discard_source(source, file_path)
+            self._messages.notify(ctx, f"Failed to play {title}: {e}")
+            self.logger.error(f"Error while opening {song.url}: {e}")
             return
 
-        next_song = self._queue_list[1]
+        if player.up_next is not song or player.voice_client is None:
+            # Cleared or skipped while it was being opened.
+            self._discard_source(source, file_path)
+            return
+
+        loop = asyncio.get_running_loop()
+        settled = asyncio.Event()
+
+        def started() -> None:
+            loop.call_soon_threadsafe(
+                self._gapless_started, ctx, player, song, title, settled
+            )
+
+        def ended(error: Exception | None) -> None:
+            loop.call_soon_threadsafe(
+                self._gapless_ended, ctx, player, song, title, file_path, error, settled
+            )
+
+        track.on_start = started
+        track.on_end = ended
+
+        gapless_source = self._gapless_source(player)
+        if gapless_source is None or not gapless_source.append(track):
+            gapless_source = GaplessSource(
+                opus=source.is_opus(), crossfade_frames=crossfade_frames
+            )
+            gapless_source.append(track)
+            try:
+                await self._wait_until_stopped(player.voice_client)
+                player.voice_client.play(
+                    gapless_source, after=partial(self._gapless_finished, ctx, loop)
+                )
+            except Exception as e:
+                # Ends the track, which unpins its file through _gapless_ended.
+                gapless_source.cleanup()
+                if player.up_next is song:
+                    player.up_next = None
+                self._messages.notify(ctx, f"Failed to play {title}: {e}")
+                self.logger.error(f"Error while playing {song.url}: {e}")
+                return
+        await settled.wait()
+
+    def _discard_source(
+        self, source: discord.AudioSource, file_path: str | None
+    ) -> None:
+        source.cleanup()
+        if file_path:
+            self._audio_cache.unpin(file_path)
+
+    def _gapless_source(self, player: GuildPlayer) -> GaplessSource | None:
+        source = player.voice_client.source if player.voice_client else None
+        return source if isinstance(source, GaplessSource) else None
+
+    async def _wait_until_stopped(
+        self, voice_client: VoiceClient, timeout: float = 1.0
+    ) -> None:
+        # A drained GaplessSource ends its player thread within a frame or so.
+        deadline = time.monotonic() + timeout
+        while voice_client.is_playing() and time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+        if voice_client.is_playing():
+            voice_client.stop()
+
+    def _gapless_started(
+        self,
+        ctx: Context,
+        player: GuildPlayer,
+        song: Queue,
+        title: str,
+        settled: asyncio.Event,
+    ) -> None:
+        player.current_track = song
+        if player.up_next is song:
+            player.up_next = None
+        if player.requested_at is not None:
+            FIRST_AUDIO_SECONDS.observe(time.monotonic() - player.requested_at)
+            player.requested_at = None
+        self._voice.touch(player.guild_id)
+        self._messages.notify(ctx, f"**Now playing:** {title}", kind="now_playing")
+        settled.set()
+
+    def _gapless_ended(
+        self,
+        ctx: Context,
+        player: GuildPlayer,
+        song: Queue,
+        title: str,
+        file_path: str | None,
+        error: Exception | None,
+        settled: asyncio.Event,
+    ) -> None:
+        if file_path:
+            self._audio_cache.unpin(file_path)
+        if error:
+            self._messages.notify(ctx, f"Error while playing {title}: {error}")
+        if player.current_track is song:
+            player.current_track = None
+            self._voice.touch(player.guild_id)
+        settled.set()
+
+    def _gapless_finished(
+        self, ctx: Context, loop: asyncio.AbstractEventLoop, error: Exception | None
+    ) -> None:
+        if error:
+            loop.call_soon_threadsafe(
+                self._messages.notify, ctx, f"Playback stopped: {error}"
+            )
 
+    async def _download_audio_file(
+        self, url: str, guild_id: int, priority: int = PLAYBACK_PRIORITY
+    ) -> tuple[str, str]:
         try:
-            await self._download_audio_file(next_song.url)
-            self.logger.info(f"Prefetched next song: {next_song.title}")
+            with DOWNLOAD_SECONDS.time():
+                return await self._download_manager.fetch(
+                    url, owner=guild_id, priority=priority
+                )
+        except JobCancelled:
+            raise
         except Exception as e:
-            self.logger.warning(f"Prefetch failed for {next_song.url}: {e}")
+            self.logger.error(f"Error downloading {url}: {e}")
+            raise
 
-    async def _download_audio_file(self, url: str) -> tuple[str, str]:
-        os.makedirs(self._downloads_dir, exist_ok=True)
+    def _download_audio_file_blocking(
+        self, interrupted: threading.Event, url: str, job: DownloadJob
+    ) -> tuple[str, str]:
+        def _check_interrupted(status: dict) -> None:
+            if interrupted.is_set():
+                raise JobCancelled(f"Download interrupted: {url}")
+            job.update_progress(status)
 
         ydl_opts = {
             "format": "bestaudio/best",
             "quiet": True,
             "noplaylist": True,
-            "outtmpl": os.path.join(self._downloads_dir, "%(title)s.%(ext)s"),
+            "outtmpl": str(
+                self._audio_cache.cache_dir / "%(extractor_key)s-%(id)s.%(ext)s"
+            ),
             "extractor_args": {"youtube": {"player_client": ["android"]}},
+            "progress_hooks": [_check_interrupted],
         }
 
-        try:
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                file_path = ydl.prepare_filename(info)
-                title = info.get("title", "Unknown Title")
-
-                if os.path.exists(file_path):
-                    self.logger.debug(f"Using cached file: {file_path}")
-                    return file_path, title
-
-                self.logger.info(f"Downloading {title} ...")
-                ydl.download([url])
-
-                if not os.path.exists(file_path):
-                    raise FileNotFoundError(
-                        f"File not found after download: {file_path}"
-                    )
+        key = self._download_manager.key_for(url)
+        metadata = self._metadata_cache.get(key)
+        if metadata:
+            cached = self._audio_cache.get(key)
+            if cached:
+                self.logger.debug(f"Using cached file: {cached}")
+                return str(cached), metadata.title
+
+        with YoutubeDL(ydl_opts) as ydl:
+            info = self._resolve_info(ydl, url, metadata)
+            key = self._audio_cache.key_for(info)
+            title = info.get("title", "Unknown Title")
+
+            # Already counted above when the metadata was cached.
+            cached = self._audio_cache.get(key, counted=metadata is None)
+            if cached:
+                self.logger.debug(f"Using cached file: {cached}")
+                return str(cached), title
+
+            _check_interrupted({})
+            self.logger.info(f"Downloading {title} ...")
+            ydl.process_info(info)
+
+            file_path = Path(ydl.prepare_filename(info))
+            if not file_path.exists():
+                raise FileNotFoundError(f"File not found after download: {file_path}")
+            DOWNLOADED_BYTES.inc(file_path.stat().st_size)
+
+            self._audio_cache.put(
+                key, file_path, audio_format=AudioFormat.from_info(info)
+            )
+            return str(file_path), title
+
+    def _resolve_info(
+        self, ydl: YoutubeDL, url: str, metadata: TrackMetadata | None
+    ) -> dict:
+        if metadata and metadata.has_streams():
+            self.logger.debug(f"Using cached metadata for {url}")
+            try:
+                return ydl.process_ie_result(dict(metadata.info), download=False)
+            except Exception as e:
+                self.logger.warning(f"Cached metadata unusable for {url}: {e}")
+
+        with EXTRACTION_SECONDS.time(kind="track"):
+            info = ydl.extract_info(url, download=False)
+        self._metadata_cache.put(ydl.sanitize_info(info))
+        return info
+
+    async def _extract_stream(self, url: str) -> tuple[str, str, AudioFormat]:
+        return await self._download_executor.run(self._extract_stream_blocking, url)
+
+    def _extract_stream_blocking(
+        self, interrupted: threading.Event, url: str
+    ) -> tuple[str, str, AudioFormat]:
+        ydl_opts = {
+            "format": "251/bestaudio/best",
+            "quiet": True,
+            "noplaylist": True,
+            "extractor_args": {"youtube": {"player_client": ["android"]}},
+        }
 
-                return file_path, title
+        metadata = self._metadata_cache.get(self._download_manager.key_for(url))
+        with YoutubeDL(ydl_opts) as ydl:
+            info = self._resolve_info(ydl, url, metadata)
+            title = info.get("title", "Unknown Title")
+            audio_info: dict | None = info if info.get("url") else None
+            if audio_info is None:
+                audio_info = next(
+                    (
+                        fmt
+                        for fmt in info.get("formats", [])
+                        if fmt.get("acodec") not in (None, "none")
+                    ),
+                    None,
+                )
+            if not audio_info:
+                raise ValueError(f"Unable to extract audio URL for {title}")
+            return audio_info["url"], title, AudioFormat.from_info(audio_info)
+
+    async def _create_source(
+        self, url: str, player: GuildPlayer
+    ) -> tuple[discord.AudioSource, str, str | None]:
+        channel = player.voice_client.channel if player.voice_client else None
+        max_bitrate_kbps = channel.bitrate // 1000 if channel else None
+
+        if self._settings.PLAYBACK_MODE == "stream":
+            try:
+                audio_url, title, audio_format = await self._extract_stream(url)
+                source = build_audio_source(
+                    audio_url,
+                    audio_format,
+                    before_options=self._settings.FFMPEG_STREAM_BEFORE_OPTIONS,
+                    max_bitrate_kbps=max_bitrate_kbps,
+                    passthrough=self._passthrough,
+                )
+                return source, title, None
+            except Exception as e:
+                self.logger.warning(
+                    f"Streaming failed for {url}, falling back to download: {e}"
+                )
 
-        except Exception as e:
-            self.logger.error(f"Error downloading {url}: {e}")
-            raise
+        file_path, title = await self._download_audio_file(url, player.guild_id)
+        self._audio_cache.pin(file_path)
+        file_format = self._audio_cache.format_for(self._download_manager.key_for(url))
+        if file_format is None and self._passthrough:
+            file_format = await probe_format(file_path)
+        source = build_audio_source(
+            file_path,
+            file_format or AudioFormat(),
+            before_options="-nostdin",
+            max_bitrate_kbps=max_bitrate_kbps,
+            passthrough=self._passthrough,
+        )
+        return source, title, file_path
 
-    # async def _play(
-    #     self,
-    #     ctx: Context,
-    #     url: str,
-    #     voice_client: VoiceClient,
-    # ) -> None:
-    #     def after_playing(error):
-    #         if error:
-    #             asyncio.run_coroutine_threadsafe(
-    #                 ctx.send(f"Stream interrupted for: {song['title']} — retrying..."),
-    #                 ctx.bot.loop,
-    #             )
-    #             asyncio.run_coroutine_threadsafe(
-    #                 self._play(ctx, url, voice_client), ctx.bot.loop
-    #             )
-    #         else:
-    #             asyncio.run_coroutine_threadsafe(
-    #                 ctx.send(f"Finished playing: {song['title']}"), ctx.bot.loop
-    #             )
-
-    #     ydl_opts = {
-    #         "format": "251/bestaudio/best",
-    #         "quiet": True,
-    #         "noplaylist": True,
-    #         "extractor_args": {"youtube": {"player_client": ["android"]}},
-    #         "downloader_args": {
-    #             "ffmpeg_i": [
-    #                 "-reconnect",
-    #                 "1",
-    #                 "-reconnect_streamed",
-    #                 "1",
-    #                 "-reconnect_delay_max",
-    #                 "5",
-    #                 "-err_detect",
-    #                 "ignore_err",
-    #                 "-timeout",
-    #                 "5000000",
-    #             ]
-    #         },
-    #     }
-
-    #     ffmpeg_before_opts = (
-    #         "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 "
-    #         "-reconnect_at_eof 1 -err_detect ignore_err -timeout 5000000 -nostdin"
-    #     )
-
-    #     try:
-    #         with YoutubeDL(ydl_opts) as ydl:
-    #             song = ydl.extract_info(url, download=False)
-    #             audio_url = next(
-    #                 (
-    #                     fmt["url"]
-    #                     for fmt in song["formats"]
-    #                     if fmt.get("acodec") != "none"
-    #                 ),
-    #                 None,
-    #             )
-    #             if audio_url:
-    #                 if not voice_client.is_playing():
-    #                     voice_client.play(
-    #                         discord.FFmpegPCMAudio(
-    #                             audio_url,
-    #                             # before_options="-nostdin",
-    #                             before_options=ffmpeg_before_opts,
-    #                             options="-vn",
-    #                         ),
-    #                         after=after_playing,
-    #                     )
-    #                     await ctx.send(f"**Now playing:** {song['title']}")
-    #             else:
-    #                 await ctx.send(
-    #                     f"Unable to extract audio URL for the requested video. This song will be skipped. {song['title']}"
-    #                 )
-
-    #     except Exception as e:
-    #         self.logger.error(f"Error while playing audio: {e}")
-    #         await ctx.send(
-    #             f"An error occurred while trying to play the requested audio: {e}"
-    #         )
     async def _play(
         self,
         ctx: Context,
         url: str,
-        voice_client: VoiceClient,
-    ) -> None:
+        player: GuildPlayer,
+    ) -> bool:
+        voice_client = player.voice_client
+        source: discord.AudioSource | None = None
+        file_path: str | None = None
+        playing = False
         try:
-            file_path, title = await self._download_audio_file(url)
+            source, title, file_path = await self._create_source(url, player)
 
             async def after_playing_wrapper(error):
                 try:
                     if error:
-                        await ctx.send(f"Error while playing {title}: {error}")
+                        self._messages.notify(
+                            ctx, f"Error while playing {title}: {error}"
+                        )
                 finally:
-                    try:
-                        if os.path.exists(file_path):
-                            os.remove(file_path)
-                            self.logger.info(f"Deleted file: {file_path}")
-                    except Exception as e:
-                        self.logger.warning(f"Failed to remove file {file_path}: {e}")
-
-                    if self._queue_list:
-                        asyncio.create_task(self._process_playlist(ctx, voice_client))
+                    if file_path:
+                        self._audio_cache.unpin(file_path)
 
             def _after_playing(error):
-                asyncio.run_coroutine_threadsafe(
-                    after_playing_wrapper(error),
-                    ctx.bot.loop,
+                ctx.bot.loop.call_soon_threadsafe(player.track_finished.set)
+                ctx.bot.loop.call_soon_threadsafe(
+                    partial(
+                        self.task_supervisor.spawn,
+                        after_playing_wrapper(error),
+                        player.guild_id,
+                        kind="after_playing",
+                    )
                 )
 
             if not voice_client.is_playing():
-                source = discord.FFmpegPCMAudio(
-                    file_path,
-                    before_options="-nostdin",
-                    options="-vn",
-                )
+                player.track_finished.clear()
                 voice_client.play(source, after=_after_playing)
-                await ctx.send(f"**Now playing:** {title}")
+                playing = True
+                if player.requested_at is not None:
+                    FIRST_AUDIO_SECONDS.observe(time.monotonic() - player.requested_at)
+                    player.requested_at = None
+                self._messages.notify(
+                    ctx, f"**Now playing:** {title}", kind="now_playing"
+                )
+                return True
 
+        except JobCancelled:
+            self.logger.info(f"Download of {url} cancelled before playback")
         except Exception as e:
-            await ctx.send(f"Failed to download or play: {e}")
+            self._messages.notify(ctx, f"Failed to download or play: {e}")
             self.logger.error(f"Error while playing {url}: {e}")
+        finally:
+            # Only the voice client's after callback releases a source it was given.
+            if not playing:
+                if source is not None:
+                    source.cleanup()
+                if file_path:
+                    self._audio_cache.unpin(file_path)
+        return False
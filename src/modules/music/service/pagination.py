@@ -0,0 +1,112 @@
+import math
+from typing import Awaitable, Callable
+
+import discord
+from attrs import define, field
+from discord.ext.commands import Context
+
+MESSAGE_LIMIT = 2000
+VIEW_TIMEOUT_SECONDS = 180
+
+PageFetcher = Callable[[int, int], Awaitable[list[str]]]
+
+
+@define
+class Paginator:
+    """
+    Renders fixed-size pages of a long listing on demand.
+
+    Only the requested page is fetched from its source, so rendering costs the
+    same for any listing length. Rendered pages are cached until the source's
+    version changes.
+    """
+
+    title: str
+    fetch: PageFetcher
+    count: Callable[[], int]
+    version: Callable[[], int]
+    page_size: int = 20
+    footer: Callable[[], str | None] | None = None
+    _pages: dict[int, str] = field(init=False, factory=dict)
+    _cached_version: int | None = field(init=False, default=None)
+
+    def page_count(self) -> int:
+        return max(math.ceil(self.count() / self.page_size), 1)
+
+    async def render(self, page: int) -> str:
+        version = self.version()
+        if version != self._cached_version:
+            self._pages.clear()
+            self._cached_version = version
+
+        page = min(max(page, 0), self.page_count() - 1)
+        content = self._pages.get(page)
+        if content is None:
+            lines = await self.fetch(page * self.page_size, self.page_size)
+            content = self._compose(page, lines)
+            if self.version() == version:
+                self._pages[page] = content
+        return content
+
+    def _compose(self, page: int, lines: list[str]) -> str:
+        header = f"**{self.title}**"
+        if self.page_count() > 1:
+            header += f" (page {page + 1}/{self.page_count()})"
+        footer = self.footer() if self.footer else None
+        tail = [footer] if footer else []
+
+        content = "\n".join([header, *lines, *tail])
+        while len(content) > MESSAGE_LIMIT and lines:
+            lines = lines[:-1]
+            content = "\n".join([header, *lines, "…", *tail])
+        return content[:MESSAGE_LIMIT]
+
+
+class PaginatorView(discord.ui.View):
+    """Previous/next buttons that flip through a Paginator by editing one message."""
+
+    def __init__(self, paginator: Paginator, timeout: float = VIEW_TIMEOUT_SECONDS):
+        super().__init__(timeout=timeout)
+        self.paginator = paginator
+        self.page = 0
+        self.message: discord.Message | None = None
+        self._update_buttons()
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous_page(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ) -> None:
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next_page(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ) -> None:
+        await self._show(interaction, self.page + 1)
+
+    async def on_timeout(self) -> None:
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+    async def _show(self, interaction: discord.Interaction, page: int) -> None:
+        self.page = min(max(page, 0), self.paginator.page_count() - 1)
+        content = await self.paginator.render(self.page)
+        self._update_buttons()
+        await interaction.response.edit_message(content=content, view=self)
+
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= self.paginator.page_count() - 1
+
+
+async def send_paginated(ctx: Context, paginator: Paginator) -> None:
+    content = await paginator.render(0)
+    if paginator.page_count() == 1:
+        await ctx.send(content)
+        return
+
+    view = PaginatorView(paginator)
+    view.message = await ctx.send(content, view=view)
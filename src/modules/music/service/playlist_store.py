@@ -0,0 +1,296 @@
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Protocol
+
+from attrs import define, field
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+PLAYLIST_DB_FILE = STATIC_DIR / "playlists.sqlite3"
+LEGACY_PLAYLIST_FILE = STATIC_DIR / "playlists.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS playlists (
+    pk INTEGER PRIMARY KEY AUTOINCREMENT,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS playlists_position ON playlists (position);
+CREATE TABLE IF NOT EXISTS tracks (
+    pk INTEGER PRIMARY KEY AUTOINCREMENT,
+    playlist_pk INTEGER NOT NULL REFERENCES playlists (pk) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tracks_playlist_position ON tracks (playlist_pk, position);
+"""
+
+
+class PlaylistRepository(Protocol):
+    """
+    Storage of memory playlists.
+
+    Playlists and tracks are addressed by their 0-based position, which is
+    what users see (shifted by one). Removing an item closes the gap.
+    ``version`` changes whenever the stored data does.
+    """
+
+    @property
+    def version(self) -> int: ...
+
+    def count_playlists(self) -> int: ...
+
+    def list_playlists(
+        self, max_tracks: int, offset: int = 0, limit: int | None = None
+    ) -> list[dict]: ...
+
+    def get_playlist(self, playlist_id: int) -> dict | None: ...
+
+    def get_playlist_page(
+        self, playlist_id: int, offset: int, limit: int
+    ) -> dict | None: ...
+
+    def create_playlist(self, title: str) -> int: ...
+
+    def delete_playlist(self, playlist_id: int) -> dict | None: ...
+
+    def add_track(self, playlist_id: int, url: str, title: str) -> dict | None: ...
+
+    def remove_track(self, playlist_id: int, track_id: int) -> dict | None: ...
+
+
+@define
+class SqlitePlaylistStore:
+    """
+    A PlaylistRepository backed by SQLite in WAL mode.
+
+    Every thread gets its own connection, so reads run concurrently while
+    writes are serialized by ``BEGIN IMMEDIATE`` transactions.
+    """
+
+    db_file: Path = PLAYLIST_DB_FILE
+    legacy_file: Path = LEGACY_PLAYLIST_FILE
+    _local: threading.local = field(init=False, factory=threading.local)
+    _version: int = field(init=False, default=0)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+        self._migrate_legacy_file()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def count_playlists(self) -> int:
+        (count,) = (
+            self._connection().execute("SELECT COUNT(*) FROM playlists").fetchone()
+        )
+        return count
+
+    def list_playlists(
+        self, max_tracks: int, offset: int = 0, limit: int | None = None
+    ) -> list[dict]:
+        """Return playlists by position; tracks are included only for short playlists."""
+        connection = self._connection()
+        rows = connection.execute(
+            "SELECT p.pk, p.position, p.title, COUNT(t.pk) FROM playlists p "
+            "LEFT JOIN tracks t ON t.playlist_pk = p.pk "
+            "WHERE p.position >= ? GROUP BY p.pk ORDER BY p.position LIMIT ?",
+            (offset, -1 if limit is None else limit),
+        ).fetchall()
+
+        playlists = []
+        for pk, position, title, count in rows:
+            data = self._tracks(pk) if count <= max_tracks else []
+            playlists.append(
+                {"id": position, "title": title, "count": count, "data": data}
+            )
+        return playlists
+
+    def get_playlist(self, playlist_id: int) -> dict | None:
+        row = self._playlist_row(playlist_id)
+        if row is None:
+            return None
+        pk, title = row
+        return {"id": playlist_id, "title": title, "data": self._tracks(pk)}
+
+    def get_playlist_page(
+        self, playlist_id: int, offset: int, limit: int
+    ) -> dict | None:
+        """Return one slice of a playlist's tracks together with the track count."""
+        row = self._playlist_row(playlist_id)
+        if row is None:
+            return None
+        pk, title = row
+        connection = self._connection()
+        (count,) = connection.execute(
+            "SELECT COUNT(*) FROM tracks WHERE playlist_pk = ?", (pk,)
+        ).fetchone()
+        rows = connection.execute(
+            "SELECT position, url, title FROM tracks "
+            "WHERE playlist_pk = ? AND position >= ? ORDER BY position LIMIT ?",
+            (pk, offset, limit),
+        )
+        return {
+            "id": playlist_id,
+            "title": title,
+            "count": count,
+            "data": [{"id": pos, "url": url, "title": t} for pos, url, t in rows],
+        }
+
+    def create_playlist(self, title: str) -> int:
+        with self._transaction() as connection:
+            (position,) = connection.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM playlists"
+            ).fetchone()
+            connection.execute(
+                "INSERT INTO playlists (position, title) VALUES (?, ?)",
+                (position, title),
+            )
+        return position
+
+    def delete_playlist(self, playlist_id: int) -> dict | None:
+        with self._transaction() as connection:
+            row = self._playlist_row(playlist_id)
+            if row is None:
+                return None
+            pk, title = row
+            connection.execute("DELETE FROM playlists WHERE pk = ?", (pk,))
+            connection.execute(
+                "UPDATE playlists SET position = position - 1 WHERE position > ?",
+                (playlist_id,),
+            )
+        return {"id": playlist_id, "title": title}
+
+    def add_track(self, playlist_id: int, url: str, title: str) -> dict | None:
+        with self._transaction() as connection:
+            row = self._playlist_row(playlist_id)
+            if row is None:
+                return None
+            pk, playlist_title = row
+            (position,) = connection.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM tracks WHERE playlist_pk = ?",
+                (pk,),
+            ).fetchone()
+            connection.execute(
+                "INSERT INTO tracks (playlist_pk, position, url, title) "
+                "VALUES (?, ?, ?, ?)",
+                (pk, position, url, title),
+            )
+        return {
+            "id": position,
+            "url": url,
+            "title": title,
+            "playlist_title": playlist_title,
+        }
+
+    def remove_track(self, playlist_id: int, track_id: int) -> dict | None:
+        """Remove a track; returns ``{"playlist_title": ...}`` plus the track if found."""
+        with self._transaction() as connection:
+            row = self._playlist_row(playlist_id)
+            if row is None:
+                return None
+            pk, playlist_title = row
+            track = connection.execute(
+                "SELECT pk, url, title FROM tracks WHERE playlist_pk = ? AND position = ?",
+                (pk, track_id),
+            ).fetchone()
+            if track is None:
+                return {"playlist_title": playlist_title}
+
+            connection.execute("DELETE FROM tracks WHERE pk = ?", (track[0],))
+            connection.execute(
+                "UPDATE tracks SET position = position - 1 "
+                "WHERE playlist_pk = ? AND position > ?",
+                (pk, track_id),
+            )
+        return {
+            "id": track_id,
+            "url": track[1],
+            "title": track[2],
+            "playlist_title": playlist_title,
+        }
+
+    def _playlist_row(self, playlist_id: int) -> tuple[int, str] | None:
+        return (
+            self._connection()
+            .execute(
+                "SELECT pk, title FROM playlists WHERE position = ?", (playlist_id,)
+            )
+            .fetchone()
+        )
+
+    def _tracks(self, playlist_pk: int) -> list[dict]:
+        rows = self._connection().execute(
+            "SELECT position, url, title FROM tracks "
+            "WHERE playlist_pk = ? ORDER BY position",
+            (playlist_pk,),
+        )
+        return [{"id": pos, "url": url, "title": title} for pos, url, title in rows]
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_file, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        self._version += 1
+
+    def _migrate_legacy_file(self) -> None:
+        if not self.legacy_file.exists():
+            return
+        (count,) = (
+            self._connection().execute("SELECT COUNT(*) FROM playlists").fetchone()
+        )
+        if count:
+            return
+
+        with open(self.legacy_file, "r", encoding="utf-8") as f:
+            playlists = json.load(f)
+
+        with self._transaction() as connection:
+            for position, playlist in enumerate(
+                sorted(playlists, key=lambda p: p["id"])
+            ):
+                cursor = connection.execute(
+                    "INSERT INTO playlists (position, title) VALUES (?, ?)",
+                    (position, playlist["title"]),
+                )
+                connection.executemany(
+                    "INSERT INTO tracks (playlist_pk, position, url, title) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (cursor.lastrowid, track_position, item["url"], item["title"])
+                        for track_position, item in enumerate(
+                            sorted(playlist["data"], key=lambda i: i["id"])
+                        )
+                    ],
+                )
+
+        migrated_file = self.legacy_file.with_suffix(".json.migrated")
+        self.legacy_file.replace(migrated_file)
+        self.logger.info(
+            f"Migrated {len(playlists)} playlists from {self.legacy_file.name}, "
+            f"the old file was kept as {migrated_file.name}"
+        )
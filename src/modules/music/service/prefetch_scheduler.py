@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from itertools import islice
+
+from attrs import define, field
+
+from .audio_cache import AudioCache
+from .download_manager import DownloadManager
+from .guild_player import GuildPlayer
+from .metadata_cache import MetadataCache
+from .yt_playlist_handler import Queue
+
+PLAYBACK_PRIORITY = 0
+PREFETCH_PRIORITY = 1
+DEFAULT_TRACK_BYTES = 8 * 1024 * 1024
+DEFAULT_AUDIO_BITRATE_KBPS = 160
+
+
+@define
+class PrefetchScheduler:
+    """
+    Keeps the next tracks of every guild queue downloaded ahead of playback.
+
+    Tracks closer to the front get better priorities, so the track about to play
+    always wins over speculative prefetches. Tracks that leave the prefetch window
+    (skipped, shuffled away or cleared) have their downloads cancelled.
+    """
+
+    _download_manager: DownloadManager
+    _audio_cache: AudioCache
+    _metadata_cache: MetadataCache
+    max_tracks: int = 3
+    max_total_size_mb: int = 200
+    _tasks: dict[int, dict[str, tuple[Queue, asyncio.Task]]] = field(
+        init=False, factory=dict
+    )
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def schedule(self, player: GuildPlayer) -> None:
+        wanted = self._prefetch_window(player)
+        tasks = self._tasks.setdefault(player.guild_id, {})
+        # Tracks already taken off the queue for playback keep their downloads.
+        playing = {
+            track.key for track in (player.current_track, player.up_next) if track
+        }
+
+        for key in list(tasks):
+            if key not in wanted and key not in playing:
+                track, task = tasks.pop(key)
+                task.cancel()
+                self._download_manager.cancel(track.url, owner=player.guild_id)
+
+        for key, (track, priority) in wanted.items():
+            if key in tasks:
+                self._download_manager.reprioritize(track.url, priority)
+            else:
+                task = asyncio.create_task(
+                    self._prefetch(player.guild_id, key, track, priority)
+                )
+                tasks[key] = (track, task)
+
+    def cancel_all(self, guild_id: int) -> None:
+        for track, task in self._tasks.pop(guild_id, {}).values():
+            task.cancel()
+            self._download_manager.cancel(track.url, owner=guild_id)
+
+    def _prefetch_window(self, player: GuildPlayer) -> dict[str, tuple[Queue, int]]:
+        wanted: dict[str, tuple[Queue, int]] = {}
+        budget = self.max_total_size_mb * 1024 * 1024
+        for position, track in enumerate(islice(player.queue_list, self.max_tracks)):
+            key = track.key
+            if key in wanted or self._audio_cache.contains(key):
+                continue
+            size = self._estimate_size(key)
+            if wanted and size > budget:
+                break
+            budget -= size
+            wanted[key] = (track, PREFETCH_PRIORITY + position)
+        return wanted
+
+    def _estimate_size(self, key: str) -> int:
+        cached = self._audio_cache.size_of(key)
+        if cached is not None:
+            return cached
+        metadata = self._metadata_cache.peek(key)
+        if metadata is None:
+            return DEFAULT_TRACK_BYTES
+
+        # The download picks bestaudio; muxed video formats would overstate it.
+        audio_only = [
+            fmt
+            for fmt in metadata.info.get("formats") or []
+            if fmt.get("vcodec") == "none"
+        ]
+        best: dict = max(audio_only, key=lambda fmt: fmt.get("abr") or 0, default={})
+        size = best.get("filesize") or best.get("filesize_approx")
+        if size:
+            return int(size)
+        if metadata.duration:
+            bitrate = best.get("abr") or DEFAULT_AUDIO_BITRATE_KBPS
+            return int(metadata.duration * bitrate * 1000 / 8)
+        return DEFAULT_TRACK_BYTES
+
+    async def _prefetch(
+        self, guild_id: int, key: str, track: Queue, priority: int
+    ) -> None:
+        try:
+            await self._download_manager.fetch(
+                track.url, owner=guild_id, priority=priority
+            )
+            self.logger.info(f"Prefetched song: {track.title}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.warning(f"Prefetch failed for {track.url}: {e}")
+        finally:
+            tasks = self._tasks.get(guild_id, {})
+            if key in tasks and tasks[key][1] is asyncio.current_task():
+                del tasks[key]
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any, Coroutine, TypeVar
+
+from attrs import define, field
+
+from .music_metrics import BACKGROUND_TASKS, TASK_SECONDS, TASKS_REJECTED
+
+T = TypeVar("T")
+
+
+@define(eq=False)
+class SupervisedTask:
+    guild_id: int
+    kind: str
+    name: str
+    task: asyncio.Task
+    coro: Coroutine
+    bounded: bool = False
+    started_at: float = field(factory=time.monotonic)
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+@define
+class TaskSupervisor:
+    """
+    Owns the background tasks of every guild.
+
+    Tasks are registered per guild so they can be cancelled together when the
+    bot leaves, and failures are logged instead of disappearing with the task.
+    Bounded work (extraction and enqueueing) runs under a per-guild and a global
+    semaphore; a guild with ``backlog_per_guild`` bounded tasks already waiting
+    or running gets new ones rejected.
+    """
+
+    per_guild_limit: int = 2
+    global_limit: int = 8
+    backlog_per_guild: int = 10
+    _tasks: dict[int, set[SupervisedTask]] = field(init=False, factory=dict)
+    _guild_slots: dict[int, asyncio.Semaphore] = field(init=False, factory=dict)
+    _global_slots: asyncio.Semaphore = field(init=False)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._global_slots = asyncio.Semaphore(self.global_limit)
+        BACKGROUND_TASKS.collect = self._counts
+
+    def spawn(
+        self,
+        coro: Coroutine[Any, Any, T],
+        guild_id: int,
+        kind: str,
+        name: str | None = None,
+        bounded: bool = False,
+    ) -> "asyncio.Task[T] | None":
+        """
+        Run ``coro`` as a task owned by ``guild_id``.
+
+        Returns None, without running ``coro``, if it is bounded and the guild's
+        backlog is full.
+        """
+        if bounded and self._bounded_count(guild_id) >= self.backlog_per_guild:
+            coro.close()
+            TASKS_REJECTED.inc(kind=kind)
+            self.logger.warning(
+                f"Rejected {kind} task for guild {guild_id}: backlog full"
+            )
+            return None
+
+        name = name or kind
+        task = asyncio.create_task(
+            self._run(coro, guild_id) if bounded else coro, name=name
+        )
+        entry = SupervisedTask(
+            guild_id=guild_id,
+            kind=kind,
+            name=name,
+            task=task,
+            coro=coro,
+            bounded=bounded,
+        )
+        self._tasks.setdefault(guild_id, set()).add(entry)
+        task.add_done_callback(lambda _: self._finished(entry))
+        return task
+
+    def cancel_guild(self, guild_id: int, kinds: set[str] | None = None) -> int:
+        """Cancel the guild's tasks (only those of ``kinds``, if given) except the caller."""
+        current = asyncio.current_task()
+        cancelled = 0
+        for entry in list(self._tasks.get(guild_id, ())):
+            if entry.task is current or entry.task.done():
+                continue
+            if kinds is not None and entry.kind not in kinds:
+                continue
+            entry.task.cancel()
+            cancelled += 1
+        if cancelled:
+            self.logger.info(f"Cancelled {cancelled} tasks of guild {guild_id}")
+        return cancelled
+
+    def running(self, guild_id: int, kinds: set[str] | None = None) -> int:
+        return sum(
+            kinds is None or entry.kind in kinds
+            for entry in self._tasks.get(guild_id, ())
+        )
+
+    def stats(self) -> dict[int, list[tuple[str, float]]]:
+        """Running tasks per guild as ``(name, age in seconds)``, oldest first."""
+        return {
+            guild_id: sorted(
+                ((entry.name, entry.age_seconds) for entry in entries),
+                key=lambda item: -item[1],
+            )
+            for guild_id, entries in self._tasks.items()
+        }
+
+    async def _run(self, coro: Coroutine[Any, Any, T], guild_id: int) -> T:
+        async with self._guild_slot(guild_id), self._global_slots:
+            return await coro
+
+    def _guild_slot(self, guild_id: int) -> asyncio.Semaphore:
+        slot = self._guild_slots.get(guild_id)
+        if slot is None:
+            slot = self._guild_slots[guild_id] = asyncio.Semaphore(self.per_guild_limit)
+        return slot
+
+    def _bounded_count(self, guild_id: int) -> int:
+        return sum(entry.bounded for entry in self._tasks.get(guild_id, ()))
+
+    def _finished(self, entry: SupervisedTask) -> None:
+        entries = self._tasks.get(entry.guild_id)
+        if entries is not None:
+            entries.discard(entry)
+            if not entries:
+                del self._tasks[entry.guild_id]
+                self._guild_slots.pop(entry.guild_id, None)
+        # A bounded task cancelled before it got a slot never awaited its coroutine.
+        entry.coro.close()
+
+        TASK_SECONDS.observe(entry.age_seconds, kind=entry.kind)
+        if entry.task.cancelled():
+            return
+        error = entry.task.exception()
+        if error is not None:
+            self.logger.error(
+                f"Task {entry.name} of guild {entry.guild_id} failed: {error!r}",
+                exc_info=error,
+            )
+
+    def _counts(self) -> dict[tuple[str, ...], float]:
+        counts: Counter[tuple[str, ...]] = Counter()
+        for entries in self._tasks.values():
+            for entry in entries:
+                counts[(entry.kind,)] += 1
+        return dict(counts)
@@ -0,0 +1,134 @@
+import functools
+import re
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from attrs import define
+
+YOUTUBE_HOSTS = {
+    "youtube.com",
+    "m.youtube.com",
+    "music.youtube.com",
+    "youtube-nocookie.com",
+}
+YOUTUBE_VIDEO_PATHS = ("/shorts/", "/live/", "/embed/", "/v/", "/e/")
+VIDEO_ID = re.compile(r"[0-9A-Za-z_-]{11}")
+PLAYLIST_ID = re.compile(r"[0-9A-Za-z_-]+")
+# Mixes and radios are generated for the video they start from; yt-dlp can only
+# read them from that video's watch page, not from /playlist.
+MIX_PLAYLIST_PREFIXES = ("RD", "UL")
+# Query parameters that only track where a link was shared from or where to
+# start playing; they never change which media a URL points to.
+IGNORED_PARAMS = {"si", "feature", "pp", "t", "start", "fbclid", "gclid"}
+
+
+@define(frozen=True)
+class TrackId:
+    """The ``(extractor, id)`` pair yt-dlp would assign, known before extraction."""
+
+    extractor: str
+    id: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.extractor}-{self.id}"
+
+
+@define(frozen=True)
+class TrackRef:
+    """
+    A URL accepted by the bot, reduced to what it refers to.
+
+    ``url`` is the canonical form that gets queued and stored. A reference with
+    a ``playlist`` is meant to be played as that playlist, even if the URL also
+    names a video.
+    """
+
+    url: str
+    video: TrackId | None = None
+    playlist: TrackId | None = None
+
+    @property
+    def is_playlist(self) -> bool:
+        return self.playlist is not None
+
+    @property
+    def key(self) -> str:
+        identity = self.playlist or self.video
+        assert identity is not None
+        return identity.key
+
+
+@functools.lru_cache(maxsize=4096)
+def identify(url: str) -> TrackRef | None:
+    """
+    Resolve ``url`` without touching the network; ``None`` if it is not a URL
+    the bot accepts.
+
+    YouTube URL variants map to the keys yt-dlp uses (``Youtube-<id>`` and
+    ``YoutubeTab-<id>``). Other sites are identified by their normalized URL,
+    which at least lets different spellings of the same link share a download.
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return None
+    if parsed.scheme.lower() not in ("http", "https") or not parsed.hostname:
+        return None
+
+    host = parsed.hostname.lower().removeprefix("www.")
+    query = dict(parse_qsl(parsed.query))
+    if host == "youtu.be" or host in YOUTUBE_HOSTS:
+        youtube = _identify_youtube(host, parsed.path, query)
+        if youtube is not None:
+            return youtube
+
+    kept = sorted((k, v) for k, v in query.items() if not _ignored_param(k))
+    canonical = urlunparse(
+        ("https", host, parsed.path.rstrip("/") or "/", "", urlencode(kept), "")
+    )
+    return TrackRef(url=canonical, video=TrackId(extractor="url", id=canonical))
+
+
+def track_key(url: str) -> str:
+    """The identity key of ``url``, or ``url`` itself if it is not accepted."""
+    ref = identify(url)
+    return ref.key if ref else url
+
+
+def _identify_youtube(host: str, path: str, query: dict[str, str]) -> TrackRef | None:
+    video_id = None
+    if host == "youtu.be":
+        video_id = path.strip("/").split("/")[0]
+    elif path == "/watch":
+        video_id = query.get("v")
+    elif path.startswith(YOUTUBE_VIDEO_PATHS):
+        video_id = path.split("/")[2]
+    elif path != "/playlist":
+        return None
+
+    playlist_id = query.get("list")
+    if playlist_id and PLAYLIST_ID.fullmatch(playlist_id):
+        video = _youtube_video(video_id)
+        url = f"https://www.youtube.com/playlist?list={playlist_id}"
+        if video is not None and playlist_id.startswith(MIX_PLAYLIST_PREFIXES):
+            url = f"https://www.youtube.com/watch?v={video.id}&list={playlist_id}"
+        return TrackRef(
+            url=url,
+            video=video,
+            playlist=TrackId(extractor="YoutubeTab", id=playlist_id),
+        )
+
+    video = _youtube_video(video_id)
+    if video is None:
+        return None
+    return TrackRef(url=f"https://www.youtube.com/watch?v={video.id}", video=video)
+
+
+def _youtube_video(video_id: str | None) -> TrackId | None:
+    if video_id and VIDEO_ID.fullmatch(video_id):
+        return TrackId(extractor="Youtube", id=video_id)
+    return None
+
+
+def _ignored_param(name: str) -> bool:
+    return name in IGNORED_PARAMS or name.startswith("utm_")
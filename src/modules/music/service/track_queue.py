@@ -0,0 +1,226 @@
+import random
+from collections import deque
+from typing import Iterable, Iterator, overload
+
+from attrs import define, field
+
+from .yt_playlist_handler import Queue
+
+BLOCK_SIZE = 256
+
+
+@define(eq=False, repr=False)
+class TrackQueue:
+    """
+    A guild queue that stays fast with tens of thousands of tracks.
+
+    Tracks live in blocks of up to ``2 * BLOCK_SIZE`` entries. Popping the front
+    and appending are O(1); positional access, insertion, removal and moves find
+    their block through a Fenwick tree over block sizes in O(log n). Block sizes
+    changed by pops and appends are only written to the tree before the next
+    positional operation, so the hot path never touches it.
+
+    ``version`` grows on every change, so consumers can cache derived views.
+    Iteration is weakly consistent: it never raises when the queue changes
+    underneath it, and a shuffle or clear swaps in new blocks instead of
+    reordering the ones an iterator is walking.
+    """
+
+    version: int = field(init=False, default=0)
+    _blocks: list[deque[Queue]] = field(init=False, factory=lambda: [deque()])
+    _head: int = field(init=False, default=0)
+    _length: int = field(init=False, default=0)
+    _sizes: list[int] = field(init=False, factory=lambda: [0])
+    _tree: list[int] = field(init=False, factory=lambda: [0, 0])
+    _dirty: set[int] = field(init=False, factory=set)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __iter__(self) -> Iterator[Queue]:
+        return self._iter_from(0)
+
+    def __repr__(self) -> str:
+        return f"TrackQueue(length={self._length}, version={self.version})"
+
+    @overload
+    def __getitem__(self, index: int) -> Queue: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Queue]: ...
+
+    def __getitem__(self, index: int | slice) -> Queue | list[Queue]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return list(self)[index]
+            if start >= stop:
+                return []
+            iterator = self._iter_from(start)
+            return [next(iterator) for _ in range(stop - start)]
+
+        block, offset = self._locate(self._normalize(index))
+        return self._blocks[block][offset]
+
+    def append(self, track: Queue) -> None:
+        if len(self._blocks[-1]) >= BLOCK_SIZE:
+            self._append_block()
+        last = len(self._blocks) - 1
+        self._blocks[last].append(track)
+        self._dirty.add(last)
+        self._length += 1
+        self.version += 1
+
+    def extend(self, tracks: Iterable[Queue]) -> None:
+        for track in tracks:
+            self.append(track)
+
+    def popleft(self) -> Queue:
+        if not self._length:
+            raise IndexError("pop from an empty queue")
+        while not self._blocks[self._head]:
+            self._head += 1
+        track = self._blocks[self._head].popleft()
+        self._dirty.add(self._head)
+        self._length -= 1
+        self.version += 1
+        if self._head > 64 and self._head * 2 > len(self._blocks):
+            self._rebuild(list(self))
+        return track
+
+    def insert(self, index: int, track: Queue) -> None:
+        """Insert before ``index``; out of range indexes clamp like ``list.insert``."""
+        if index < 0:
+            index = max(index + self._length, 0)
+        if index >= self._length:
+            self.append(track)
+            return
+
+        block, offset = self._locate(index)
+        self._blocks[block].insert(offset, track)
+        self._dirty.add(block)
+        self._length += 1
+        self.version += 1
+        if len(self._blocks[block]) > 2 * BLOCK_SIZE:
+            self._split(block)
+
+    def remove_at(self, index: int) -> Queue:
+        block, offset = self._locate(self._normalize(index))
+        track = self._blocks[block][offset]
+        del self._blocks[block][offset]
+        self._dirty.add(block)
+        self._length -= 1
+        self.version += 1
+        return track
+
+    def move(self, source: int, destination: int) -> None:
+        self.insert(destination, self.remove_at(source))
+
+    def shuffle(self) -> None:
+        tracks = list(self)
+        random.shuffle(tracks)
+        self._rebuild(tracks)
+        self.version += 1
+
+    def clear(self) -> None:
+        self._rebuild([])
+        self.version += 1
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("queue index out of range")
+        return index
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Return the block holding ``index`` and the offset inside it."""
+        head_size = len(self._blocks[self._head])
+        if index < head_size:
+            return self._head, index
+        tail_size = len(self._blocks[-1])
+        if index >= self._length - tail_size:
+            return len(self._blocks) - 1, index - (self._length - tail_size)
+
+        self._sync()
+        position, remaining = 0, index
+        step = 1 << (len(self._blocks).bit_length() - 1)
+        while step:
+            candidate = position + step
+            if candidate <= len(self._blocks) and self._tree[candidate] <= remaining:
+                position = candidate
+                remaining -= self._tree[candidate]
+            step >>= 1
+        return position, remaining
+
+    def _iter_from(self, start: int) -> Iterator[Queue]:
+        if start >= self._length:
+            return
+        blocks = self._blocks
+        block, offset = self._locate(start)
+        while block < len(blocks):
+            yield from tuple(blocks[block])[offset:]
+            block, offset = block + 1, 0
+
+    def _sync(self) -> None:
+        for block in self._dirty:
+            delta = len(self._blocks[block]) - self._sizes[block]
+            if delta:
+                self._sizes[block] += delta
+                self._tree_add(block, delta)
+        self._dirty.clear()
+
+    def _tree_add(self, block: int, delta: int) -> None:
+        node = block + 1
+        while node < len(self._tree):
+            self._tree[node] += delta
+            node += node & -node
+
+    def _prefix(self, count: int) -> int:
+        total = 0
+        while count:
+            total += self._tree[count]
+            count -= count & -count
+        return total
+
+    def _append_block(self) -> None:
+        self._blocks.append(deque())
+        self._sizes.append(0)
+        node = len(self._blocks)
+        self._tree.append(self._prefix(node - 1) - self._prefix(node - (node & -node)))
+
+    def _split(self, block: int) -> None:
+        tracks = list(self._blocks[block])
+        self._blocks = [
+            *self._blocks[:block],
+            deque(tracks[:BLOCK_SIZE]),
+            deque(tracks[BLOCK_SIZE:]),
+            *self._blocks[block + 1 :],
+        ]
+        self._rebuild_index()
+
+    def _rebuild(self, tracks: list[Queue]) -> None:
+        self._blocks = [
+            deque(tracks[start : start + BLOCK_SIZE])
+            for start in range(0, len(tracks), BLOCK_SIZE)
+        ] or [deque()]
+        self._head = 0
+        self._length = len(tracks)
+        self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        self._blocks = [block for block in self._blocks[self._head :] if block] or [
+            deque()
+        ]
+        self._head = 0
+        self._sizes = [len(block) for block in self._blocks]
+        self._tree = [0] * (len(self._blocks) + 1)
+        for node in range(1, len(self._tree)):
+            self._tree[node] += self._sizes[node - 1]
+            parent = node + (node & -node)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[node]
+        self._dirty.clear()
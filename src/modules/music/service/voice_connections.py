@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, cast
+
+from attrs import define, field
+from discord import VoiceChannel, VoiceClient
+from discord.ext.commands import Context
+
+from .music_metrics import VOICE_CONNECTS
+
+
+@define(eq=False)
+class VoiceLease:
+    voice_client: VoiceClient
+    last_activity: float = field(factory=time.monotonic)
+    timer: asyncio.Task | None = None
+
+
+@define
+class VoiceConnectionManager:
+    """
+    Keeps one voice connection per guild warm while the guild is active.
+
+    Every activity pushes the guild's idle deadline ``idle_grace_seconds`` into
+    the future. When the deadline passes, the connection is closed only if
+    ``is_busy`` says nothing is playing, queued or loading; otherwise the
+    deadline is pushed again. Joining a command from another channel moves the
+    existing connection instead of reconnecting.
+    """
+
+    is_busy: Callable[[int], bool]
+    on_idle: Callable[[int], Awaitable[None]]
+    idle_grace_seconds: float = 300.0
+    _leases: dict[int, VoiceLease] = field(init=False, factory=dict)
+    logger: logging.Logger = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def connect(self, ctx: Context, current: VoiceClient | None) -> VoiceClient:
+        """The guild's connection, moved to the author's channel if it can be."""
+        guild_id = ctx.guild.id  # type: ignore[union-attr]
+        channel = cast(VoiceChannel, ctx.author.voice.channel)  # type: ignore[union-attr]
+        voice_client = current or cast(VoiceClient | None, ctx.voice_client)
+
+        if voice_client is not None and not voice_client.is_connected():
+            await voice_client.disconnect(force=True)
+            voice_client = None
+
+        if voice_client is None:
+            voice_client = await channel.connect()
+            VOICE_CONNECTS.inc(result="new")
+        elif voice_client.channel.id != channel.id and self._can_move(voice_client):
+            await voice_client.move_to(channel)
+            VOICE_CONNECTS.inc(result="moved")
+        else:
+            VOICE_CONNECTS.inc(result="reused")
+
+        lease = self._leases.get(guild_id)
+        if lease is None or lease.voice_client is not voice_client:
+            self.forget(guild_id)
+            lease = self._leases[guild_id] = VoiceLease(voice_client=voice_client)
+            lease.timer = asyncio.create_task(self._watch(guild_id, lease))
+        self.touch(guild_id)
+        return voice_client
+
+    def touch(self, guild_id: int) -> None:
+        lease = self._leases.get(guild_id)
+        if lease is not None:
+            lease.last_activity = time.monotonic()
+
+    def forget(self, guild_id: int) -> None:
+        lease = self._leases.pop(guild_id, None)
+        if lease is not None and lease.timer is not None:
+            if lease.timer is not asyncio.current_task():
+                lease.timer.cancel()
+
+    def _can_move(self, voice_client: VoiceClient) -> bool:
+        # Don't pull the bot away from people who are listening to it.
+        listeners = [m for m in voice_client.channel.members if not m.bot]
+        return not voice_client.is_playing() or not listeners
+
+    async def _watch(self, guild_id: int, lease: VoiceLease) -> None:
+        while self._leases.get(guild_id) is lease:
+            deadline = lease.last_activity + self.idle_grace_seconds
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+
+            if not lease.voice_client.is_connected():
+                self.forget(guild_id)
+                return
+            if self.is_busy(guild_id):
+                self.touch(guild_id)
+                continue
+
+            self.logger.info(
+                f"Disconnecting from {lease.voice_client.channel} after "
+                f"{self.idle_grace_seconds:.0f}s of inactivity"
+            )
+            self.forget(guild_id)
+            await self.on_idle(guild_id)
+            await lease.voice_client.disconnect(force=True)
+            return
@@ -1,90 +1,154 @@
+from __future__ import annotations
+
 import asyncio
-import json
-from typing import NamedTuple
+import functools
+import logging
+from typing import Iterator, NamedTuple
+
+from attrs import define, field
 
-from attrs import define
-from discord.ext.commands import Context
+from .extractor_pool import ExtractorPool
+from .metadata_cache import MetadataCache
+from .music_metrics import EXTRACTION_SECONDS
+from .task_supervisor import TaskSupervisor
+from .track_identity import identify, track_key
 
 
 class Queue(NamedTuple):
     url: str
     title: str
 
+    @property
+    def key(self) -> str:
+        return track_key(self.url)
+
+
+@define(eq=False)
+class PlaylistCursor:
+    """The not yet materialized remainder of a YouTube playlist."""
+
+    url: str
+    title: str
+    total: int | None
+    _entries: Iterator[dict]
+    loaded: int = 0
+    exhausted: bool = False
+    _lock: asyncio.Lock = field(factory=asyncio.Lock)
+
+    @property
+    def remaining(self) -> int | None:
+        if self.exhausted:
+            return 0
+        return None if self.total is None else max(self.total - self.loaded, 0)
+
 
 @define
 class YtPlaylistHandler:
-    async def get_remaining_urls_from_playlist(
-        self, url: str, queue_list: list[Queue], ctx: Context
-    ) -> None:
-        await self._get_urls(url=url, queue_list=queue_list, ctx=ctx)
-
-    @staticmethod
-    async def _get_urls(url: str, queue_list: list[Queue], ctx: Context) -> None:
-        process = await asyncio.create_subprocess_exec(
-            "yt-dlp",
-            url,
-            "--skip-download",
-            "--no-warning",
-            "--print",
-            "title",
-            "--print",
-            "webpage_url",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+    _extractor_pool: ExtractorPool = field(factory=ExtractorPool)
+    _metadata_cache: MetadataCache = field(factory=MetadataCache)
+    _resolving: set[str] = field(init=False, factory=set)
+    logger: logging.Logger = field(init=False)
 
-        try:
-            while True:
-                title_line = await process.stdout.readline()  # type: ignore[union-attr]
-                if not title_line:
-                    await ctx.send(
-                        f"**Playlist gathered**, current queue length: {len(queue_list)}"
-                    )
-                    break
-                title = title_line.decode("utf-8").strip()
-
-                url_line = await process.stdout.readline()  # type: ignore[union-attr]
-                url = url_line.decode("utf-8").strip()
-                que = Queue(url=url, title=title)
-                print(f"Add {que}")
-                queue_list.append(que)
-
-        except Exception as e:
-            print(f"An error occurred: {e}")
-
-        await process.wait()
-
-    @staticmethod
-    async def _fetch_title_from_url(url: str) -> str:
-        process = await asyncio.create_subprocess_exec(
-            "yt-dlp",
-            "--get-title",
-            url,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+    def __attrs_post_init__(self) -> None:
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def open_playlist(self, url: str) -> PlaylistCursor:
+        with EXTRACTION_SECONDS.time(kind="playlist"):
+            info, entries = await self._extractor_pool.open_playlist(url)
+        await self._cache_playlist_info(info)
+        return PlaylistCursor(
+            url=url,
+            title=info.get("title") or "Unknown playlist",
+            total=info.get("playlist_count"),
+            entries=entries,
         )
 
+    async def next_page(self, cursor: PlaylistCursor, page_size: int) -> list[Queue]:
+        """Read the next page of flat entries as lightweight queue placeholders."""
+        async with cursor._lock:
+            if cursor.exhausted:
+                return []
+            with EXTRACTION_SECONDS.time(kind="playlist_page"):
+                entries = await self._extractor_pool.read_entries(
+                    cursor._entries, page_size
+                )
+            if len(entries) < page_size:
+                cursor.exhausted = True
+            cursor.loaded += len(entries)
+
+        page = []
+        for entry in entries:
+            ref = identify(entry.get("url") or entry.get("webpage_url") or "")
+            if ref is None:
+                continue
+            entry_url = ref.url
+            que = Queue(url=entry_url, title=entry.get("title") or "Unknown title")
+            self.logger.debug(f"Add {que}")
+            page.append(que)
+        return page
+
+    def resolve_metadata(
+        self, urls: list[str], supervisor: TaskSupervisor, guild_id: int
+    ) -> None:
+        """
+        Fetch full metadata for tracks about to play, unless already cached.
+
+        The lookups run as bounded "metadata" tasks of ``guild_id``.
+        """
+        for url in urls:
+            ref = identify(url)
+            if ref is None or ref.video is None:
+                continue
+            key = ref.video.key
+            if key in self._resolving:
+                continue
+            if self._metadata_cache.peek(key):
+                continue
+            task = supervisor.spawn(
+                self._fetch_title_from_url(url),
+                guild_id,
+                kind="metadata",
+                bounded=True,
+            )
+            if task is None:
+                return
+            self._resolving.add(key)
+            task.add_done_callback(functools.partial(self._resolved, key))
+
+    def _resolved(self, key: str, _: asyncio.Task) -> None:
+        self._resolving.discard(key)
+
+    async def _fetch_title_from_url(self, url: str) -> str:
+        ref = identify(url)
+        metadata = await self._metadata_cache.aget(
+            ref.video.key if ref and ref.video else None
+        )
+        if metadata:
+            return metadata.title
         try:
-            stdout, _ = await process.communicate()
-            title = stdout.decode("utf-8").strip()
-            return title
+            with EXTRACTION_SECONDS.time(kind="title"):
+                info = await self._extractor_pool.extract(url, process=False)
+            await self._metadata_cache.aput(info)
+            return info.get("title", "Unknown")
         except Exception:
-            return "Unknwon"
-
-    @staticmethod
-    async def _fetch_playlist_title_from_url(url: str) -> str:
-        process = await asyncio.create_subprocess_exec(
-            "yt-dlp",
-            "--dump-single-json",
-            "--flat-playlist",
-            url,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+            return "Unknown"
 
+    async def _fetch_playlist_title_from_url(self, url: str) -> str:
+        ref = identify(url)
+        metadata = await self._metadata_cache.aget(
+            ref.playlist.key if ref and ref.playlist else None
+        )
+        if metadata:
+            return metadata.title
         try:
-            stdout, _ = await process.communicate()
-            info = json.loads(stdout.decode("utf-8"))
+            info, _ = await self._extractor_pool.open_playlist(url)
+            await self._cache_playlist_info(info)
             return info.get("title", "Unknown playlist")
         except Exception:
             return "Unknown playlist"
+
+    async def _cache_playlist_info(self, info: dict) -> None:
+        if info.get("id"):
+            await self._metadata_cache.aput(
+                info, static_ttl_seconds=self._metadata_cache.stream_ttl_seconds
+            )
@@ -0,0 +1,28 @@
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class MusicSettings(BaseSettings):
+    EXTRACTOR_WORKERS: int = 4
+    METADATA_MEMORY_ENTRIES: int = 1024
+    METADATA_STATIC_TTL_SECONDS: int = 7 * 24 * 3600
+    METADATA_STREAM_TTL_SECONDS: int = 3600
+    PREFETCH_TRACKS: int = 3
+    PREFETCH_MAX_MB: int = 200
+    PLAYLIST_PAGE_SIZE: int = 50
+    PLAYLIST_REFILL_BELOW: int = 10
+    VOICE_IDLE_GRACE_SECONDS: float = 300
+    COMMAND_CONCURRENCY_PER_GUILD: int = 2
+    COMMAND_CONCURRENCY_GLOBAL: int = 8
+    COMMAND_BACKLOG_PER_GUILD: int = 10
+    PLAYBACK_MODE: Literal["download", "stream"] = "download"
+    OPUS_PASSTHROUGH: bool = True
+    GAPLESS: bool = False
+    CROSSFADE_SECONDS: float = 0.0
+    FFMPEG_STREAM_BEFORE_OPTIONS: str = (
+        "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 "
+        "-err_detect ignore_err -timeout 5000000 -nostdin"
+    )
+
+    model_config = SettingsConfigDict(env_prefix="MUSIC_CONFIG_", case_sensitive=True)
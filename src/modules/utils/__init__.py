@@ -1,4 +1,5 @@
 from .cog.utils_cog import UtilsCog as UtilsCog
 from .logging import LOGGING_CONFIG as LOGGING_CONFIG
+from .logging import setup_logging as setup_logging
 from .service.cleanup_files_service import CleanupService as CleanupService
 from .service.utils_service import UtilsService as UtilsService
@@ -27,7 +27,6 @@ class UtilsCog(Cog):
     def __init__(self, bot: DiscordBot, utils_service: UtilsService):
         self.bot = bot
         self._utils_service = utils_service
-        self._utils_service.start_check_inactivity(bot=self.bot)
 
     @command(name="h", help="Show help for commands")
     async def help_music(self, ctx: Context):
@@ -79,9 +78,7 @@ class UtilsCog(Cog):
 
     @command(name="l", help="Leave the voice channel")
     async def leave(self, ctx: Context) -> None:
-        if self.bot.music_service._playlist_task:
-            self.bot.music_service._playlist_task.cancel()
-        await self.bot.clear_music_queue()
+        await self.bot.clear_music_queue(guild_id=ctx.guild.id)  # type: ignore[union-attr]
         await self._utils_service.leave(
             ctx=ctx, voice_clients=cast(list[VoiceClient], self.bot.voice_clients)
         )
@@ -1,3 +1,12 @@
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,10 +15,85 @@ class LoggerSettings(BaseSettings):
     LOG_FORMAT: str = (
         "%(asctime)s:%(name)s:%(funcName)s:%(lineno)d %(levelname)s %(message)s"
     )
+    JSON_FORMAT: bool = False
+    QUEUE_SIZE: int = 10000
+    # Records per second allowed per logger below WARNING; the rest are dropped
+    # and counted.
+    RATE_LIMITS: dict[str, float] = {
+        "src.modules.music.service.yt_playlist_handler": 20,
+        "src.modules.music.service.download_manager": 20,
+        "src.modules.music.service.prefetch_scheduler": 20,
+    }
 
     model_config = SettingsConfigDict(env_prefix="LOGGER_CONFIG_", case_sensitive=True)
 
 
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per logger prefix for records below WARNING.
+
+    Dropped records are counted and the count is appended to the next record of
+    that logger that gets through.
+    """
+
+    def __init__(self, limits: dict[str, float]):
+        super().__init__()
+        self.limits = limits
+        self._buckets: dict[str, list[float]] = {}
+        self._dropped: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        prefix = self._limit_for(record.name)
+        if prefix is None:
+            return True
+
+        rate = self.limits[prefix]
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(prefix, [rate, now])
+            tokens = min(rate, tokens + (now - updated) * rate)
+            if tokens < 1:
+                self._buckets[prefix] = [tokens, now]
+                self._dropped[prefix] = self._dropped.get(prefix, 0) + 1
+                return False
+            self._buckets[prefix] = [tokens - 1, now]
+            dropped = self._dropped.pop(prefix, 0)
+
+        if dropped:
+            record.msg = f"{record.getMessage()} ({dropped} similar records dropped)"
+            record.args = None
+        return True
+
+    def _limit_for(self, name: str) -> str | None:
+        for prefix in self.limits:
+            if name == prefix or name.startswith(f"{prefix}."):
+                return prefix
+        return None
+
+
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -17,18 +101,22 @@ LOGGING_CONFIG = {
         "default": {
             "format": LoggerSettings().LOG_FORMAT,
             "datefmt": "%Y-%m-%d %H:%M:%S",
-        }
+        },
+        "json": {
+            "()": JsonFormatter,
+            "datefmt": "%Y-%m-%dT%H:%M:%S%z",
+        },
     },
     "handlers": {
         "logfile": {
-            "formatter": "default",
+            "formatter": "json" if LoggerSettings().JSON_FORMAT else "default",
             "level": "DEBUG",
             "class": "logging.handlers.TimedRotatingFileHandler",
             "filename": LoggerSettings().LOGFILE_PATHNAME,
             "when": "midnight",
         },
         "console": {
-            "formatter": "default",
+            "formatter": "json" if LoggerSettings().JSON_FORMAT else "default",
             "level": "DEBUG",
             "class": "logging.StreamHandler",
             "stream": "ext://sys.stdout",
@@ -43,3 +131,46 @@ LOGGING_CONFIG = {
     },
     "root": {"level": "NOTSET", "handlers": ["logfile", "console"]},
 }
+
+
+def setup_logging(config: dict = LOGGING_CONFIG) -> QueueListener:
+    """
+    Apply ``config`` and move its file and console output to a background thread.
+
+    The configured handlers are taken off the root and ``discord`` loggers and
+    fed by a single QueueListener; callers only pay for putting the record on a
+    queue. When the queue is full, records are dropped rather than blocking.
+    """
+    settings = LoggerSettings()
+    dictConfig(config)
+
+    handlers: list[logging.Handler] = []
+    loggers = [logging.getLogger(), logging.getLogger("discord")]
+    for logger in loggers:
+        for handler in logger.handlers:
+            if handler not in handlers:
+                handlers.append(handler)
+
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(settings.QUEUE_SIZE)
+    queue_handler = _DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(settings.RATE_LIMITS))
+    for logger in loggers:
+        logger.handlers = [queue_handler]
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(_stop_listener, listener)
+    return listener
+
+
+def _stop_listener(listener: QueueListener) -> None:
+    if listener._thread is not None:  # type: ignore[attr-defined]
+        listener.stop()
+
+
+class _DroppingQueueHandler(QueueHandler):
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
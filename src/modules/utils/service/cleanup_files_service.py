@@ -5,79 +5,78 @@ from pathlib import Path
 
 from attrs import define, field
 
+from src.modules.music import AudioCache, MetadataCache
+
 
 @define
 class CleanupService:
     """
-    A background service that periodically cleans up old music files.
+    A background service that keeps the audio cache within its size budget.
+
+    The cache enforces its budget itself after every download; this service
+    retries evictions that were blocked by tracks still playing and, rarely,
+    reconciles the index with the directory in a worker thread. It also deletes
+    expired rows of the metadata cache, which are otherwise only skipped.
     """
 
-    target_dir: Path = Path("downloads/")
-    max_age_hours: int = 10
+    audio_cache: AudioCache
+    metadata_cache: MetadataCache | None = None
     interval_seconds: int = 3600
-    max_total_size_mb: int = 400
+    reconcile_interval_seconds: int = 24 * 3600
+    untracked_grace_seconds: int = 3600
+    _last_reconcile: float | None = field(init=False, default=None)
     logger: logging.Logger = field(init=False)
 
     def __attrs_post_init__(self) -> None:
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+    @property
+    def target_dir(self) -> Path:
+        return self.audio_cache.cache_dir
+
     async def run(self) -> None:
         """Run cleanup periodically in the background."""
         self.logger.info(
             f"CleanupService started — every {self.interval_seconds // 60} min, "
-            f"max age {self.max_age_hours}h, max size {self.max_total_size_mb}MB."
+            f"max size {self.audio_cache.max_total_size_mb}MB."
         )
 
         while True:
             try:
-                await self._cleanup_old_files()
+                if self._reconcile_due():
+                    await self._reconcile()
                 await self._enforce_size_limit()
+                await self._purge_metadata()
             except Exception as e:
                 self.logger.error(f"Cleanup error: {e}")
             await asyncio.sleep(self.interval_seconds)
 
-    async def _cleanup_old_files(self) -> None:
-        if not self.target_dir.exists():
-            return
-
-        now = time.time()
-        threshold = now - (self.max_age_hours * 3600)
-        deleted_files = []
-
-        for file in self.target_dir.iterdir():
-            if file.is_file() and file.stat().st_mtime < threshold:
-                try:
-                    file.unlink()
-                    deleted_files.append(file.name)
-                except Exception as e:
-                    self.logger.warning(f"Could not delete {file.name}: {e}")
+    def _reconcile_due(self) -> bool:
+        return (
+            self._last_reconcile is None
+            or time.monotonic() - self._last_reconcile
+            >= self.reconcile_interval_seconds
+        )
 
+    async def _reconcile(self) -> None:
+        deleted_files = await asyncio.to_thread(
+            self.audio_cache.reconcile, self.untracked_grace_seconds
+        )
+        self._last_reconcile = time.monotonic()
         if deleted_files:
             files_list = ", ".join(deleted_files)
-            self.logger.info(f"Deleted {len(deleted_files)} old files: {files_list}")
+            self.logger.info(
+                f"Deleted {len(deleted_files)} untracked files: {files_list}"
+            )
 
     async def _enforce_size_limit(self) -> None:
-        if not self.target_dir.exists():
-            return
-
-        files = [f for f in self.target_dir.iterdir() if f.is_file()]
-        files.sort(key=lambda f: f.stat().st_mtime)
-
-        total_size = sum(f.stat().st_size for f in files) / (1024 * 1024)
-        deleted = 0
+        budget = self.audio_cache.max_total_size_mb * 1024 * 1024
+        if self.audio_cache.total_size() > budget:
+            await asyncio.to_thread(self.audio_cache.evict)
 
-        while total_size > self.max_total_size_mb and files:
-            oldest = files.pop(0)
-            try:
-                size_mb = oldest.stat().st_size / (1024 * 1024)
-                oldest.unlink()
-                total_size -= size_mb
-                deleted += 1
-            except Exception as e:
-                self.logger.warning(f"Could not delete {oldest}: {e}")
-
-        if deleted:
-            self.logger.info(
-                f"Enforced size limit — deleted {deleted} files, "
-                f"current total: {total_size:.2f} MB"
-            )
+    async def _purge_metadata(self) -> None:
+        if self.metadata_cache is None:
+            return
+        purged = await asyncio.to_thread(self.metadata_cache.purge_expired)
+        if purged:
+            self.logger.info(f"Purged {purged} expired metadata entries")